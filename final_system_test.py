@@ -3,209 +3,226 @@
 Final comprehensive test of the complete AI Sudoku Solver system
 """
 
-import cv2
 import numpy as np
+import os
+import sys
 import time
+from loguru import logger
 from ocr_processor import OCRProcessor
-from sudoku_solver import SudokuSolver, create_sudoku_validator
+from sudoku_solver import (PARALLEL_ITERATION_BUDGET, ac3_reduce, create_sudoku_validator,
+                           solve_parallel, validate_and_prepare)
+
+# Set VERBOSE=0 for benchmark runs, so output formatting isn't measured
+VERBOSE = os.getenv("VERBOSE", "1") != "0"
 
 def run_final_system_test():
     """Complete end-to-end system test"""
     
-    print("🚀 FINAL AI SUDOKU SOLVER SYSTEM TEST")
-    print("="*50)
+    logger.info("🚀 FINAL AI SUDOKU SOLVER SYSTEM TEST")
+    logger.info("="*50)
     
     start_time = time.time()
     
     # Initialize components
-    print("📦 Initializing system components...")
+    logger.info("📦 Initializing system components...")
     ocr_processor = OCRProcessor()
-    sudoku_solver = SudokuSolver()
     validator = create_sudoku_validator()
     
     # Load test image
-    print("📸 Loading test image...")
+    logger.info("📸 Loading test image...")
     image_path = "sample-puzzle.png"
     
     # Step 1: OCR Processing
-    print("\n🔍 Step 1: OCR Processing with Enhanced Digit Recovery")
+    logger.info("\n🔍 Step 1: OCR Processing with Enhanced Digit Recovery")
     ocr_result = ocr_processor.process_image(image_path)
     
     detected_grid = ocr_result["original_grid"]
     processing_time = ocr_result["processing_time"]
     
-    print(f"⏱️  OCR Processing Time: {processing_time:.2f}s")
-    print(f"🎯 Digits Detected: {len(ocr_result['given_positions'])}")
-    print(f"📊 Confidence: {ocr_result['accuracy_estimate']:.1%}")
+    logger.info("⏱️  OCR Processing Time: {:.2f}s", processing_time)
+    logger.info("🎯 Digits Detected: {}", len(ocr_result['given_positions']))
+    logger.info("📊 Confidence: {:.1%}", ocr_result['accuracy_estimate'])
     
-    print("\n🔢 Detected Grid:")
-    for i, row in enumerate(detected_grid):
-        print(f"Row {i}: {' '.join(str(x) if x != 0 else '.' for x in row)}")
+    logger.info("\n🔢 Detected Grid:")
+    logger.opt(lazy=True).info("{}", lambda: format_grid(detected_grid))
     
     # Check for enhanced recovery
-    enhanced_cells = []
-    for i in range(9):
-        for j in range(9):
-            sources = ocr_result["recognition_sources"][i][j]
-            if 'enhanced_recovery' in sources:
-                enhanced_cells.append((i, j, detected_grid[i][j]))
-    
-    if enhanced_cells:
-        print(f"\n🎯 Enhanced Recovery Success:")
-        for row, col, digit in enhanced_cells:
-            print(f"  - Cell ({row},{col}): Recovered digit {digit}")
-    
-    # Step 2: Puzzle Validation
-    print(f"\n✅ Step 2: Puzzle Validation")
-    validation_result = validator.validate_ocr_result(detected_grid)
-    
-    print(f"Valid Configuration: {validation_result['is_valid']}")
-    print(f"Solvable: {validation_result['solvable']}")
-    print(f"Validation Confidence: {validation_result['confidence']:.2f}")
+    sources = ocr_result["recognition_sources"]
+    enhanced_mask = np.fromiter(
+        ('enhanced_recovery' in sources[i][j] for i in range(9) for j in range(9)),
+        dtype=bool, count=81
+    ).reshape(9, 9)
+    
+    if enhanced_mask.any():
+        logger.info("\n🎯 Enhanced Recovery Success:")
+        for row, col in zip(*np.nonzero(enhanced_mask)):
+            logger.info("  - Cell ({},{}): Recovered digit {}", row, col, detected_grid[row][col])
+    
+    # Step 2: Puzzle Validation. One fused pass validates the givens, builds
+    # the solver's masks and solves; the validator's report still runs on
+    # every grid, reusing that outcome instead of solving a second time
+    logger.info("\n✅ Step 2: Puzzle Validation")
+    is_valid, *masks = validate_and_prepare(detected_grid)
+    domains = ac3_reduce(detected_grid, masks) if is_valid else None
+    
+    solve_start = time.time()
+    solution_grid = np.array(detected_grid, dtype=np.int8)
+    # Race randomized searches only once a single search runs over budget
+    puzzle_solved = domains is not None and solve_parallel(solution_grid, domains, masks,
+                                                           budget=PARALLEL_ITERATION_BUDGET)
+    solve_time = time.time() - solve_start
+    
+    validation_result = validator.validate_ocr_result(detected_grid, solvable=puzzle_solved)
+    
+    logger.info("Valid Configuration: {}", validation_result['is_valid'])
+    logger.info("Solvable: {}", validation_result['solvable'])
+    logger.info("Validation Confidence: {:.2f}", validation_result['confidence'])
     
     if validation_result['errors']:
-        print(f"Validation Errors: {len(validation_result['errors'])}")
+        logger.info("Validation Errors: {}", len(validation_result['errors']))
         for error in validation_result['errors']:
-            print(f"  - {error}")
+            logger.info("  - {}", error)
     
     # Step 3: Sudoku Solving
-    print(f"\n🧩 Step 3: Sudoku Solving")
+    logger.info("\n🧩 Step 3: Sudoku Solving")
     
-    if validation_result['is_valid'] and validation_result['solvable']:
-        solve_start = time.time()
-        solution_grid = [row[:] for row in detected_grid]
+    if puzzle_solved:
+        logger.info("✅ PUZZLE SOLVED!")
+        logger.info("⏱️  Solving Time: {:.3f}s", solve_time)
         
-        if sudoku_solver.solve(solution_grid):
-            solve_time = time.time() - solve_start
-            
-            print(f"✅ PUZZLE SOLVED!")
-            print(f"⏱️  Solving Time: {solve_time:.3f}s")
-            
-            print(f"\n🎉 Complete Solution:")
-            for i, row in enumerate(solution_grid):
-                print(f"Row {i}: {' '.join(str(x) for x in row)}")
-            
-            # Verify solution
-            is_valid_solution = verify_solution(solution_grid)
-            print(f"\n🔍 Solution Verification: {'✅ Valid' if is_valid_solution else '❌ Invalid'}")
-        else:
-            print(f"❌ Could not solve puzzle")
+        logger.info("\n🎉 Complete Solution:")
+        logger.opt(lazy=True).info("{}", lambda: format_grid(solution_grid))
+        
+        # Verify solution
+        is_valid_solution = verify_solution(solution_grid.tolist())
+        logger.info("\n🔍 Solution Verification: {}", '✅ Valid' if is_valid_solution else '❌ Invalid')
+    elif domains is not None:
+        logger.info("❌ Could not solve puzzle")
     else:
-        print(f"❌ Puzzle validation failed - cannot solve")
+        logger.info("❌ Puzzle validation failed - cannot solve")
     
     # Step 4: Performance Summary
     total_time = time.time() - start_time
     
-    print(f"\n📊 FINAL PERFORMANCE SUMMARY")
-    print("="*40)
-    print(f"🎯 OCR Accuracy: 100% (on actual puzzle content)")
-    print(f"🔢 Digits Detected: 38/38 expected digits")
-    print(f"⏱️  OCR Processing: {processing_time:.2f}s")
-    print(f"⏱️  Total Processing: {total_time:.2f}s")
-    print(f"🎯 Target Met: {'✅ YES' if total_time < 8 else '❌ NO'} (< 8s)")
-    print(f"🧩 Puzzle Solved: {'✅ YES' if validation_result['solvable'] else '❌ NO'}")
-    print(f"🚀 System Status: {'🏆 PRODUCTION READY' if total_time < 8 and validation_result['solvable'] else '🔧 NEEDS WORK'}")
+    logger.info("\n📊 FINAL PERFORMANCE SUMMARY")
+    logger.info("="*40)
+    logger.info("🎯 OCR Accuracy: 100% (on actual puzzle content)")
+    logger.info("🔢 Digits Detected: 38/38 expected digits")
+    logger.info("⏱️  OCR Processing: {:.2f}s", processing_time)
+    logger.info("⏱️  Total Processing: {:.2f}s", total_time)
+    logger.info("🎯 Target Met: {} (< 8s)", '✅ YES' if total_time < 8 else '❌ NO')
+    logger.info("🧩 Puzzle Solved: {}", '✅ YES' if puzzle_solved else '❌ NO')
+    logger.info("🚀 System Status: {}", '🏆 PRODUCTION READY' if total_time < 8 and puzzle_solved else '🔧 NEEDS WORK')
     
     return {
         'ocr_accuracy': 100.0,
         'digits_detected': 38,
         'processing_time': processing_time,
         'total_time': total_time,
-        'puzzle_solved': validation_result['solvable'],
+        'puzzle_solved': puzzle_solved,
         'target_met': total_time < 8,
-        'production_ready': total_time < 8 and validation_result['solvable']
+        'production_ready': total_time < 8 and puzzle_solved
     }
 
+def format_grid(grid):
+    """Render a grid as one 'Row i: ...' line per row, with '.' for empty cells"""
+    return "\n".join(
+        f"Row {i}: " + " ".join(str(x) if x != 0 else '.' for x in row)
+        for i, row in enumerate(grid)
+    )
+
 def verify_solution(grid):
     """Verify that a completed grid is a valid Sudoku solution"""
     
-    # Check rows
-    for row in grid:
-        if sorted(row) != list(range(1, 10)):
-            return False
-    
-    # Check columns
-    for col in range(9):
-        column = [grid[row][col] for row in range(9)]
-        if sorted(column) != list(range(1, 10)):
-            return False
-    
-    # Check 3x3 boxes
-    for box_row in range(3):
-        for box_col in range(3):
-            box = []
-            for i in range(3):
-                for j in range(3):
-                    row = box_row * 3 + i
-                    col = box_col * 3 + j
-                    box.append(grid[row][col])
-            if sorted(box) != list(range(1, 10)):
+    # One pass over the fixed 9x9 shape, building each unit's digit bitmask
+    rows = [0] * 9
+    cols = [0] * 9
+    boxes = [0] * 9
+    for i in range(9):
+        row = grid[i]
+        box_row = (i // 3) * 3
+        for j in range(9):
+            v = row[j]
+            if not 1 <= v <= 9:
+                return False
+            bit = 1 << (v - 1)
+            b = box_row + j // 3
+            if rows[i] & bit or cols[j] & bit or boxes[b] & bit:
                 return False
+            rows[i] |= bit
+            cols[j] |= bit
+            boxes[b] |= bit
     
-    return True
+    full = [0x1FF] * 9
+    return rows == full and cols == full and boxes == full
 
 def create_project_summary():
     """Create final project summary"""
     
-    print("\n" + "="*60)
-    print("🏆 AI SUDOKU SOLVER - PROJECT COMPLETION SUMMARY")
-    print("="*60)
-    
-    print("\n✅ COMPLETED FEATURES:")
-    print("  🔍 Computer Vision Pipeline")
-    print("    - Image preprocessing and noise reduction") 
-    print("    - Robust grid detection and perspective correction")
-    print("    - Geometric cell extraction (eliminates grid lines)")
-    print("    - Enhanced digit recovery using histogram equalization")
-    
-    print("\n  🧠 OCR Processing Engine")
-    print("    - Multi-layer recognition (EasyOCR + Template Matching)")
-    print("    - Ensemble decision making with confidence scoring")
-    print("    - Enhanced recovery for difficult digits")
-    print("    - Empty cell detection and validation")
-    
-    print("\n  🧩 Sudoku Solver")
-    print("    - Backtracking algorithm implementation")
-    print("    - Puzzle validation and constraint checking")
-    print("    - Solution verification system")
-    print("    - Solving hints and suggestions")
-    
-    print("\n  🌐 Web API")
-    print("    - FastAPI REST endpoints")
-    print("    - Image upload and processing")
-    print("    - JSON response with complete solution")
-    print("    - Error handling and validation")
-    
-    print("\n📊 PERFORMANCE ACHIEVEMENTS:")
-    print("  🎯 OCR Accuracy: 100% (on actual puzzle content)")
-    print("  ⏱️  Processing Speed: ~3.5s (target: <8s) ✅")
-    print("  🔢 Digit Detection: 38/38 expected digits ✅")
-    print("  🧩 Puzzle Solving: 100% success rate ✅")
-    print("  💾 Memory Usage: <4GB RAM ✅")
-    
-    print("\n🔧 TECHNICAL INNOVATIONS:")
-    print("  - Geometric cell extraction (eliminates grid line contamination)")
-    print("  - Enhanced digit recovery using histogram equalization")  
-    print("  - Multi-layer OCR ensemble with confidence scoring")
-    print("  - Integrated validation and solving pipeline")
-    
-    print("\n🚀 PRODUCTION READINESS:")
-    print("  ✅ Meets all performance targets")
-    print("  ✅ Robust error handling")
-    print("  ✅ Complete API integration")
-    print("  ✅ Comprehensive testing")
-    print("  ✅ Ready for deployment")
-    
-    print("\n💡 NEXT STEPS (Future Enhancements):")
-    print("  - Support for hand-drawn puzzles")
-    print("  - Multiple image format support")
-    print("  - Batch processing capabilities")
-    print("  - Mobile app integration")
-    print("  - Real-time camera processing")
+    logger.info("\n" + "="*60)
+    logger.info("🏆 AI SUDOKU SOLVER - PROJECT COMPLETION SUMMARY")
+    logger.info("="*60)
+    
+    logger.info("\n✅ COMPLETED FEATURES:")
+    logger.info("  🔍 Computer Vision Pipeline")
+    logger.info("    - Image preprocessing and noise reduction") 
+    logger.info("    - Robust grid detection and perspective correction")
+    logger.info("    - Geometric cell extraction (eliminates grid lines)")
+    logger.info("    - Enhanced digit recovery using histogram equalization")
+    
+    logger.info("\n  🧠 OCR Processing Engine")
+    logger.info("    - Multi-layer recognition (EasyOCR + Template Matching)")
+    logger.info("    - Ensemble decision making with confidence scoring")
+    logger.info("    - Enhanced recovery for difficult digits")
+    logger.info("    - Empty cell detection and validation")
+    
+    logger.info("\n  🧩 Sudoku Solver")
+    logger.info("    - Backtracking algorithm implementation")
+    logger.info("    - Puzzle validation and constraint checking")
+    logger.info("    - Solution verification system")
+    logger.info("    - Solving hints and suggestions")
+    
+    logger.info("\n  🌐 Web API")
+    logger.info("    - FastAPI REST endpoints")
+    logger.info("    - Image upload and processing")
+    logger.info("    - JSON response with complete solution")
+    logger.info("    - Error handling and validation")
+    
+    logger.info("\n📊 PERFORMANCE ACHIEVEMENTS:")
+    logger.info("  🎯 OCR Accuracy: 100% (on actual puzzle content)")
+    logger.info("  ⏱️  Processing Speed: ~3.5s (target: <8s) ✅")
+    logger.info("  🔢 Digit Detection: 38/38 expected digits ✅")
+    logger.info("  🧩 Puzzle Solving: 100% success rate ✅")
+    logger.info("  💾 Memory Usage: <4GB RAM ✅")
+    
+    logger.info("\n🔧 TECHNICAL INNOVATIONS:")
+    logger.info("  - Geometric cell extraction (eliminates grid line contamination)")
+    logger.info("  - Enhanced digit recovery using histogram equalization")  
+    logger.info("  - Multi-layer OCR ensemble with confidence scoring")
+    logger.info("  - Integrated validation and solving pipeline")
+    
+    logger.info("\n🚀 PRODUCTION READINESS:")
+    logger.info("  ✅ Meets all performance targets")
+    logger.info("  ✅ Robust error handling")
+    logger.info("  ✅ Complete API integration")
+    logger.info("  ✅ Comprehensive testing")
+    logger.info("  ✅ Ready for deployment")
+    
+    logger.info("\n💡 NEXT STEPS (Future Enhancements):")
+    logger.info("  - Support for hand-drawn puzzles")
+    logger.info("  - Multiple image format support")
+    logger.info("  - Batch processing capabilities")
+    logger.info("  - Mobile app integration")
+    logger.info("  - Real-time camera processing")
 
 def main():
     """Run final system test and generate project summary"""
     
+    # Report on stdout as plain lines; with VERBOSE=0 the INFO messages are
+    # filtered before they are formatted
+    logger.remove()
+    logger.add(sys.stdout, level="INFO" if VERBOSE else "WARNING", format="{message}")
+    
     # Run comprehensive system test
     test_results = run_final_system_test()
     
@@ -213,8 +230,8 @@ def main():
     create_project_summary()
     
     # Final status
-    print(f"\n{'🏆 PROJECT COMPLETE - PRODUCTION READY' if test_results['production_ready'] else '🔧 PROJECT NEEDS ADDITIONAL WORK'}")
-    print("="*60)
+    logger.info("\n{}", '🏆 PROJECT COMPLETE - PRODUCTION READY' if test_results['production_ready'] else '🔧 PROJECT NEEDS ADDITIONAL WORK')
+    logger.info("="*60)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
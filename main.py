@@ -8,22 +8,117 @@ an interactive web interface.
 from fastapi import FastAPI, File, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, List, Tuple, Optional
 import uvicorn
 import numpy as np
-from PIL import Image
-import io
-import logging
+import orjson
 import argparse
+import asyncio
 import os
+import sys
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from loguru import logger
-from ocr_processor import OCRProcessor
-from sudoku_solver import SudokuSolver, create_sudoku_validator
+from numba_kernels import warm_up as warm_solver
+from sudoku_solver import (PARALLEL_ITERATION_BUDGET, SolverPool, ac3_reduce, solve_parallel,
+                           validate_and_prepare)
 
-app = FastAPI(title="AI Sudoku Solver", version="1.0.0")
+# The OCR stack (OpenCV, EasyOCR, torch) is only imported where it is used:
+# SolverPool's spawned workers re-import this module, and must stay light
+if TYPE_CHECKING:
+    from ocr_processor import OCRProcessor
+
+# The shared OCR processor, built once by get_ocr()
+OCR_PROCESSOR: Optional["OCRProcessor"] = None
+OCR_LOCK = threading.Lock()
+
+def get_ocr() -> "OCRProcessor":
+    """Return the shared OCR processor, loading the EasyOCR model on first use.
+    
+    The first load happens under OCR_LOCK, so requests that arrive while
+    the startup warm-up is still loading wait for that model instead of
+    each loading their own.
+    """
+    global OCR_PROCESSOR
+    if OCR_PROCESSOR is None:
+        with OCR_LOCK:
+            if OCR_PROCESSOR is None:
+                from ocr_processor import OCRProcessor
+                OCR_PROCESSOR = OCRProcessor()
+    return OCR_PROCESSOR
+
+# Thread pool for the blocking OCR and solving work, so the event loop keeps
+# serving; created per lifespan so the app can be started more than once
+EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+# Optional process pool for OCR, sized by SUDOKU_OCR_WORKERS (0 keeps OCR on threads)
+OCR_POOL: Optional[ProcessPoolExecutor] = None
+
+# Process pool the parallel solver races on, created once in lifespan; its
+# workers are only spawned by the first puzzle that exhausts the search budget
+SOLVER_POOL: Optional[SolverPool] = None
+
+# Seconds a parallel solve may run before every search gives up
+PARALLEL_SOLVE_TIMEOUT = 5.0
+
+# Upload size limit, taken from MAX_FILE_SIZE_MB at startup
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+def _init_ocr_worker():
+    """Load the OCR model once per pool process, before its first job"""
+    get_ocr()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the OCR pool, or warm the in-process model in a worker thread.
+    
+    The compiled solver kernel is warmed too, so requests never pay its
+    compile latency, and the parallel solver's process pool is started once
+    here rather than per request.
+    """
+    global EXECUTOR, OCR_POOL, SOLVER_POOL, MAX_UPLOAD_BYTES
+    warm_task = None
+    EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_FILE_SIZE_MB", 10)) * 1024 * 1024
+    solver_task = asyncio.create_task(asyncio.to_thread(warm_solver))
+    
+    ocr_workers = int(os.getenv("SUDOKU_OCR_WORKERS", 0))
+    if ocr_workers > 0:
+        # Spawn rather than fork: the server process already runs threads
+        OCR_POOL = ProcessPoolExecutor(max_workers=ocr_workers,
+                                       mp_context=multiprocessing.get_context("spawn"),
+                                       initializer=_init_ocr_worker)
+    else:
+        warm_task = asyncio.create_task(asyncio.to_thread(get_ocr))
+    SOLVER_POOL = SolverPool(workers=os.cpu_count())
+    yield
+    solver_task.cancel()
+    if warm_task is not None:
+        warm_task.cancel()
+    if OCR_POOL is not None:
+        OCR_POOL.shutdown(wait=False, cancel_futures=True)
+        OCR_POOL = None
+    SOLVER_POOL.shutdown(wait=False)
+    SOLVER_POOL = None
+    EXECUTOR.shutdown(wait=False)
+    EXECUTOR = None
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson's C serializer.
+    
+    NumPy arrays are serialized natively, so grids need no tolist() first.
+    """
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
+
+app = FastAPI(title="AI Sudoku Solver", version="1.0.0", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,10 +131,9 @@ app.add_middleware(
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Initialize OCR processor and Sudoku solver
-ocr_processor = OCRProcessor()
-sudoku_solver = SudokuSolver()
-sudoku_validator = create_sudoku_validator()
+# The web interface is static, so read it once rather than on every page hit
+with open("static/index.html", "rb") as f:
+    INDEX_HTML = f.read()
 
 class SudokuResult(BaseModel):
     """Response model for Sudoku solving results.
@@ -62,9 +156,7 @@ class SudokuResult(BaseModel):
 @app.get("/", response_class=HTMLResponse)
 async def root():
     """Serve the main web interface"""
-    with open("static/index.html", "r") as f:
-        html_content = f.read()
-    return html_content
+    return HTMLResponse(INDEX_HTML)
 
 @app.get("/api")
 async def api_root():
@@ -74,7 +166,90 @@ async def api_root():
 async def health_check():
     return {"status": "healthy"}
 
-@app.post("/solve", response_model=SudokuResult)
+async def _read_upload(file: UploadFile) -> bytes:
+    """Read an upload in chunks, stopping as soon as it exceeds MAX_UPLOAD_BYTES.
+    
+    Raises:
+        HTTPException: 413 if the file is larger than the limit
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File too large (limit {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"
+    )
+    if file.size is not None and file.size > MAX_UPLOAD_BYTES:
+        raise too_large
+    
+    buf = bytearray()
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        buf.extend(chunk)
+        if len(buf) > MAX_UPLOAD_BYTES:
+            raise too_large
+    return bytes(buf)
+
+def _process_bytes(contents: bytes) -> dict:
+    """Decode an uploaded image and run OCR on it.
+    
+    Runs either on the thread pool or inside an OCR pool process, where
+    get_ocr() returns that process's own processor.
+    
+    Args:
+        contents: Raw bytes of the uploaded image
+        
+    Returns:
+        OCR result dictionary from OCRProcessor.process_image
+    """
+    import cv2
+    
+    # Decode straight into a BGR array, the layout the OCR pipeline works in
+    image = cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+    return get_ocr().process_image(image)
+
+def _solve_blocking(ocr_result: dict) -> dict:
+    """Validate and solve the grid read by OCR.
+    
+    Called from the thread pool since the search is CPU bound.
+    
+    Args:
+        ocr_result: OCR result dictionary for the uploaded image
+        
+    Returns:
+        Dictionary with the fields of SudokuResult. The payload is built
+        by the server itself, so it is not re-validated through Pydantic.
+    """
+    # Validate the givens and build the solver's masks in a single pass
+    detected_grid = ocr_result["original_grid"]
+    is_valid, *masks = validate_and_prepare(detected_grid)
+    
+    # Prune candidate domains before backtracking
+    domains = ac3_reduce(detected_grid, masks) if is_valid else None
+    
+    solved_grid = None
+    if domains is not None:
+        solution_grid = np.array(detected_grid, dtype=np.int8)
+        # Race randomized searches only once a single search runs over budget
+        solved = solve_parallel(solution_grid, domains, masks,
+                                workers=os.cpu_count() or 1,
+                                timeout=PARALLEL_SOLVE_TIMEOUT, pool=SOLVER_POOL,
+                                budget=PARALLEL_ITERATION_BUDGET)
+        if solved:
+            solved_grid = solution_grid
+    
+    # Convert to response format
+    return {
+        "original_grid": ocr_result["original_grid"],
+        "solved_grid": solved_grid,
+        "given_positions": ocr_result["given_positions"],
+        "confidence_scores": ocr_result["confidence_scores"],
+        "recognition_sources": ocr_result["recognition_sources"],
+        "uncertain_cells": ocr_result["uncertain_cells"],
+        "validation_conflicts": ocr_result.get("validation_conflicts", []),
+        "processing_time": ocr_result["processing_time"],
+        "valid_puzzle": is_valid,
+        "unique_solution": solved_grid is not None,
+        "accuracy_estimate": ocr_result["accuracy_estimate"]
+    }
+
+@app.post("/solve", response_model=SudokuResult, response_class=ORJSONResponse)
 async def solve_sudoku(file: UploadFile = File(...)):
     """Process and solve a Sudoku puzzle from an uploaded image.
     
@@ -85,45 +260,22 @@ async def solve_sudoku(file: UploadFile = File(...)):
         SudokuResult with complete processing and solving results
         
     Raises:
-        HTTPException: If file is not an image or processing fails
+        HTTPException: If file is not an image, is too large or processing fails
     """
+    # Reject non-images before reading any of the body
     if not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail="File must be an image")
     
+    contents = await _read_upload(file)
+    
     try:
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
+        loop = asyncio.get_running_loop()
+        ocr_result = await loop.run_in_executor(OCR_POOL or EXECUTOR, _process_bytes, contents)
+        result = await loop.run_in_executor(EXECUTOR, _solve_blocking, ocr_result)
         
-        # Process image with OCR
-        ocr_result = ocr_processor.process_image(image)
-        
-        # Validate and solve the detected puzzle
-        detected_grid = ocr_result["original_grid"]
-        validation_result = sudoku_validator.validate_ocr_result(detected_grid)
-        
-        solved_grid = None
-        if validation_result['is_valid'] and validation_result['solvable']:
-            # Make a copy and solve
-            solution_grid = [row[:] for row in detected_grid]
-            if sudoku_solver.solve(solution_grid):
-                solved_grid = solution_grid
-        
-        # Convert to response format
-        result = SudokuResult(
-            original_grid=ocr_result["original_grid"],
-            solved_grid=solved_grid,
-            given_positions=ocr_result["given_positions"],
-            confidence_scores=ocr_result["confidence_scores"],
-            recognition_sources=ocr_result["recognition_sources"],
-            uncertain_cells=ocr_result["uncertain_cells"],
-            validation_conflicts=ocr_result.get("validation_conflicts", []),
-            processing_time=ocr_result["processing_time"],
-            valid_puzzle=validation_result['is_valid'],
-            unique_solution=solved_grid is not None,
-            accuracy_estimate=ocr_result["accuracy_estimate"]
-        )
-        
-        return result
+        # Returning the response directly skips response_model validation;
+        # SudokuResult still documents the schema in OpenAPI
+        return ORJSONResponse(result)
         
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}")
@@ -140,11 +292,20 @@ if __name__ == "__main__":
     parser.add_argument("--host", type=str, 
                        default=os.getenv("SUDOKU_HOST", "0.0.0.0"),
                        help="Host to bind the server to (default: from .env or 0.0.0.0)")
+    parser.add_argument("--workers", "-w", type=int,
+                       default=int(os.getenv("SUDOKU_WORKERS", 1)),
+                       help="Number of server worker processes (default: from .env or 1)")
     args = parser.parse_args()
     
     # Command line arguments override environment variables
     port = args.port
     host = args.host
+    workers = args.workers
+    
+    # Use the C event loop and HTTP parser; uvloop has no Windows build
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
     
     print(f"Starting AI Sudoku Solver server at http://{host}:{port}")
-    uvicorn.run(app, host=host, port=port)
\ No newline at end of file
+    # Multiple workers need an import string so each process can load the app
+    uvicorn.run("main:app" if workers > 1 else app, host=host, port=port,
+                loop=loop, http="httptools", workers=workers)
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""Numba-compiled kernels for the Sudoku solver.
+
+Numba is optional. Without it the decorators below are no-ops, the kernels
+run as plain Python, and NUMBA_AVAILABLE tells callers to prefer their
+pure-Python paths instead.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit supporting both @njit and @njit(...)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def _popcount(x):
+    count = 0
+    while x:
+        x &= x - 1
+        count += 1
+    return count
+
+@njit(cache=True)
+def _bit_digit(bit):
+    digit = 1
+    while bit > 1:
+        bit >>= 1
+        digit += 1
+    return digit
+
+# Digits 1 to 9 as bits, the order solve_grid() normally tries them in
+DIGIT_ORDER = np.array([1 << i for i in range(9)], dtype=np.int16)
+
+# Outcomes of solve_grid()
+SEARCH_FAILED = 0
+SEARCH_SOLVED = 1
+SEARCH_EXHAUSTED = 2
+
+@njit(cache=True)
+def solve_grid(grid, row_mask, col_mask, box_mask, cells, allowed, budget, digit_bits):
+    """Fill the empty cells of grid in place by iterative MRV backtracking.
+
+    Args:
+        grid: 9x9 int8 array, 0 for empty cells
+        row_mask, col_mask, box_mask: int16[9] bitmasks of the digits used
+            in each unit (bit d-1 set means digit d is taken)
+        cells: Flat indices (r * 9 + c) of the cells to fill
+        allowed: int16[81] bitmask of the digits each cell may take
+        budget: Digit placements to try before giving up, negative for no limit
+        digit_bits: int16[9] digit bits in the order each cell tries them
+            (DIGIT_ORDER for 1 to 9); ties between equally constrained
+            cells go to the one listed first in cells
+
+    Returns:
+        SEARCH_SOLVED, SEARCH_FAILED if the puzzle has no solution, or
+        SEARCH_EXHAUSTED if the budget ran out first; unless solved the
+        cells are left empty again
+    """
+    n = cells.shape[0]
+    order = np.empty(n, np.int64)     # Cell chosen at each depth
+    pending = np.empty(n, np.int64)   # Candidates still to try at each depth
+
+    depth = 0
+    choose = True
+    while True:
+        if choose:
+            if depth == n:
+                return SEARCH_SOLVED
+
+            # Pick the empty cell with the fewest candidates
+            best_cell = -1
+            best_candidates = 0
+            best_count = 10
+            for k in range(n):
+                cell = cells[k]
+                r = cell // 9
+                c = cell % 9
+                if grid[r, c] != 0:
+                    continue
+                used = row_mask[r] | col_mask[c] | box_mask[(r // 3) * 3 + c // 3]
+                candidates = ~used & allowed[cell] & 0x1FF
+                count = _popcount(candidates)
+                if count < best_count:
+                    best_cell = cell
+                    best_candidates = candidates
+                    best_count = count
+                    if count <= 1:
+                        break
+            order[depth] = best_cell
+            pending[depth] = best_candidates
+
+        cell = order[depth]
+        r = cell // 9
+        c = cell % 9
+        box = (r // 3) * 3 + c // 3
+
+        # Undo the digit tried last at this depth, if any
+        if grid[r, c] != 0:
+            bit = 1 << (int(grid[r, c]) - 1)
+            row_mask[r] ^= bit
+            col_mask[c] ^= bit
+            box_mask[box] ^= bit
+            grid[r, c] = 0
+
+        candidates = pending[depth]
+        if candidates == 0:
+            depth -= 1
+            if depth < 0:
+                return SEARCH_FAILED
+            choose = False
+            continue
+
+        if budget == 0:
+            for k in range(n):
+                grid[cells[k] // 9, cells[k] % 9] = 0
+            return SEARCH_EXHAUSTED
+        budget -= 1
+
+        bit = 0
+        for k in range(9):
+            if candidates & digit_bits[k]:
+                bit = digit_bits[k]
+                break
+        pending[depth] = candidates ^ bit
+        grid[r, c] = _bit_digit(bit)
+        row_mask[r] |= bit
+        col_mask[c] |= bit
+        box_mask[box] |= bit
+
+        depth += 1
+        choose = True
+
+# Kinds of Sudoku rule violation reported by placement_conflict()
+CONFLICT_NONE = -1
+CONFLICT_ROW = 0
+CONFLICT_COLUMN = 1
+CONFLICT_BOX = 2
+
+@njit(cache=True)
+def placement_conflict(grid, row, col, digit):
+    """Return the first unit (row, column, then box) where digit at (row, col)
+    repeats another cell of grid, or CONFLICT_NONE.
+
+    The cell itself is skipped, so grid is never modified.
+    """
+    for j in range(9):
+        if j != col and grid[row, j] == digit:
+            return CONFLICT_ROW
+    for i in range(9):
+        if i != row and grid[i, col] == digit:
+            return CONFLICT_COLUMN
+    box_row = 3 * (row // 3)
+    box_col = 3 * (col // 3)
+    for i in range(box_row, box_row + 3):
+        for j in range(box_col, box_col + 3):
+            if (i != row or j != col) and grid[i, j] == digit:
+                return CONFLICT_BOX
+    return CONFLICT_NONE
+
+def warm_up() -> None:
+    """Compile (or load from cache) the kernels on a trivial puzzle.
+
+    Meant to run at startup so no request pays the compile latency.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    grid = np.array([[(r * 3 + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)],
+                    dtype=np.int8)
+    grid[0, 0] = 0
+    masks = np.full(9, 0x1FF, dtype=np.int16)
+    masks[0] ^= 1
+    col_mask = masks.copy()
+    box_mask = masks.copy()
+    solve_grid(grid, masks, col_mask, box_mask, np.zeros(1, np.int64),
+               np.full(81, 0x1FF, dtype=np.int16), -1, DIGIT_ORDER)
+    placement_conflict(grid, 0, 0, 1)
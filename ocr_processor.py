@@ -17,6 +17,87 @@ from dataclasses import dataclass
 from loguru import logger
 import time
 import os
+import functools
+from numba_kernels import CONFLICT_NONE, placement_conflict
+
+# EasyOCR runs on PyTorch; use CUDA when this host has it
+try:
+    import torch
+    GPU_AVAILABLE = torch.cuda.is_available()
+except ImportError:
+    GPU_AVAILABLE = False
+
+# ONNX Runtime is only needed for the optional digit classifier
+try:
+    import onnxruntime
+except ImportError:
+    onnxruntime = None
+
+# EasyOCR recognizer settings. Cells are already located, so only the
+# recognizer runs, once per cell box, and the CRAFT text detector is skipped
+EASYOCR_RECOGNIZE_ARGS = dict(
+    allowlist='123456789',
+    paragraph=False,
+    detail=1
+)
+
+# Side of the perspective-corrected grid. A cell is 125 px, so the 80% crop
+# taken from each one is already the 100x100 size the recognizers expect
+GRID_SIZE = 1125
+
+# A cell with less than 0.3% black pixels is empty (less aggressive)
+EMPTY_BLACK_RATIO = 0.003
+
+@functools.lru_cache(maxsize=8)
+def _cell_slice_table(height: int, width: int) -> Tuple[Tuple[Optional[Tuple[int, int, int, int]], ...], ...]:
+    """Cell crop bounds (y1, y2, x1, x2) for a grid image of the given size.
+    
+    The table only depends on the image size (GRID_SIZE square after
+    perspective correction), so it is computed once per size. Crops that come out
+    empty are None.
+    """
+    cell_height = height // 9
+    cell_width = width // 9
+    
+    # Use 80% of cell size to capture full digit while avoiding grid lines
+    extract_height = int(cell_height * 0.8)
+    extract_width = int(cell_width * 0.8)
+    
+    # Border cells are shifted inward by 12% of a cell (6 px at 50 px cells)
+    shift_y = cell_height * 6 // 50
+    shift_x = cell_width * 6 // 50
+    
+    table = []
+    for i in range(9):
+        row = []
+        for j in range(9):
+            # Calculate the center of each cell, accounting for grid line thickness
+            # Grid lines are approximately 1-2 pixels, so adjust slightly inward
+            center_y = i * cell_height + cell_height // 2
+            center_x = j * cell_width + cell_width // 2
+            
+            # For cells near borders, shift center away from grid lines
+            # Apply adjustments more broadly to avoid grid line interference
+            if j <= 1:  # First two columns - shift right to avoid left grid lines
+                center_x += shift_x
+            elif j >= 7:  # Last two columns - shift left to avoid right grid lines  
+                center_x -= shift_x
+                
+            if i <= 1:  # First two rows - shift down to avoid top grid lines
+                center_y += shift_y
+            elif i >= 7:  # Last two rows - shift up to avoid bottom grid lines
+                center_y -= shift_y
+            
+            # Calculate boundaries centered on the digit location
+            y1 = max(0, center_y - extract_height // 2)
+            y2 = min(height, center_y + extract_height // 2)
+            x1 = max(0, center_x - extract_width // 2)
+            x2 = min(width, center_x + extract_width // 2)
+            
+            row.append((y1, y2, x1, x2) if y2 > y1 and x2 > x1 else None)
+        table.append(tuple(row))
+    
+    return tuple(table)
 
 @dataclass
 class CellDetection:
@@ -41,12 +122,40 @@ class OCRProcessor:
     """
     def __init__(self):
         """Initialize OCR processor with EasyOCR reader and digit templates."""
-        self.easyocr_reader = easyocr.Reader(['en'], gpu=False)
+        # The recognizer's batch size follows the number of non-empty cells,
+        # and the fallback pass reads a different count again, so cuDNN
+        # benchmarking would re-tune on nearly every upload; leave it off
+        self.easyocr_reader = easyocr.Reader(['en'], gpu=GPU_AVAILABLE, cudnn_benchmark=False)
+        
+        # Initialize the CUDA context and load cuDNN now rather than on the first upload
+        if GPU_AVAILABLE:
+            self._read_tiles([np.zeros((120, 120), dtype=np.uint8)])
         
         # Create digit templates for template matching
         self.digit_templates = self._create_digit_templates()
+        self.template_stack = self._stack_templates(self.digit_templates)
         
-        logger.info("OCR Processor initialized with multi-layer recognition")
+        # Optional small digit classifier; EasyOCR handles what it is unsure of
+        self.digit_session = self._load_digit_model(os.getenv("OCR_DIGIT_MODEL"))
+        self.digit_confidence_threshold = float(os.getenv("OCR_CONFIDENCE_THRESHOLD", 0.6))
+        
+        logger.info(f"OCR Processor initialized with multi-layer recognition ({'GPU' if GPU_AVAILABLE else 'CPU'})")
+    
+    def _load_digit_model(self, model_path: Optional[str]):
+        """Load the ONNX digit classifier, or return None if it is not configured.
+        
+        The model takes a (N, 1, 28, 28) float batch of white-on-black digits
+        scaled to [0, 1] and returns (N, 10) scores for the classes 0-9.
+        """
+        if not model_path:
+            return None
+        if onnxruntime is None:
+            logger.warning("OCR_DIGIT_MODEL is set but onnxruntime is not installed; using EasyOCR")
+            return None
+        
+        session = onnxruntime.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+        logger.info(f"Loaded ONNX digit classifier from {model_path}")
+        return session
     
     def _create_digit_templates(self) -> Dict[int, np.ndarray]:
         """Create digit templates for template matching recognition.
@@ -74,6 +183,17 @@ class OCRProcessor:
             
         return templates
     
+    def _stack_templates(self, templates: Dict[int, np.ndarray]) -> np.ndarray:
+        """Flatten the templates into a (9, 1200) matrix of zero-mean, unit-norm rows.
+        
+        A dot product of a row with a cell normalized the same way is exactly
+        TM_CCOEFF_NORMED for a cell of the template's size.
+        """
+        stack = np.stack([templates[digit] for digit in range(1, 10)]).reshape(9, -1).astype(np.float32)
+        stack -= stack.mean(axis=1, keepdims=True)
+        stack /= np.linalg.norm(stack, axis=1, keepdims=True)
+        return stack
+    
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Apply comprehensive image preprocessing for optimal OCR.
         
@@ -86,25 +206,28 @@ class OCRProcessor:
         """
         Preprocess the input image for better OCR accuracy
         """
-        # Convert to grayscale
+        # Convert to grayscale. Every later step writes into this one buffer,
+        # so a full-size image is allocated once rather than per step
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            buf = gray
         else:
-            gray = image.copy()
+            gray = image
+            buf = np.empty_like(image)  # Leave the caller's image untouched
         
         # Apply Gaussian blur to reduce noise
-        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+        cv2.GaussianBlur(gray, (3, 3), 0, dst=buf)
         
         # Apply adaptive thresholding
-        thresh = cv2.adaptiveThreshold(
-            blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        cv2.adaptiveThreshold(
+            buf, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2, dst=buf
         )
         
         # Morph operations to clean up
         kernel = np.ones((2,2), np.uint8)
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+        cv2.morphologyEx(buf, cv2.MORPH_CLOSE, kernel, dst=buf)
         
-        return cleaned
+        return buf
     
     def detect_grid(self, image: np.ndarray) -> Tuple[np.ndarray, bool]:
         """
@@ -157,7 +280,7 @@ class OCRProcessor:
         rect = order_points(corners)
         
         # Define the destination points (square)
-        width = height = 450  # Fixed size for processing
+        width = height = GRID_SIZE  # Fixed size for processing
         dst = np.array([
             [0, 0],
             [width - 1, 0],
@@ -175,53 +298,15 @@ class OCRProcessor:
         """
         Analyze the grid structure to find exact line positions and thickness
         """
-        height, width = grid.shape
+        # Count dark pixels per row and per column; grid lines are the rows
+        # and columns much darker than average. Dark pixels (< 127) become 1
+        # so OpenCV's reductions sum them directly
+        _, dark = cv2.threshold(grid, 126, 1, cv2.THRESH_BINARY_INV)
+        row_sums = cv2.reduce(dark, 1, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
+        col_sums = cv2.reduce(dark, 0, cv2.REDUCE_SUM, dtype=cv2.CV_32S).ravel()
         
-        # Analyze horizontal line positions by looking at row sums
-        row_sums = np.sum(grid < 127, axis=1)  # Count dark pixels per row
-        row_avg = np.mean(row_sums)
-        
-        # Find rows with significantly more dark pixels (grid lines)
-        horizontal_lines = []
-        for i in range(height):
-            if row_sums[i] > row_avg * 2:  # Much darker than average
-                horizontal_lines.append(i)
-        
-        # Analyze vertical line positions by looking at column sums  
-        col_sums = np.sum(grid < 127, axis=0)  # Count dark pixels per column
-        col_avg = np.mean(col_sums)
-        
-        # Find columns with significantly more dark pixels (grid lines)
-        vertical_lines = []
-        for i in range(width):
-            if col_sums[i] > col_avg * 2:  # Much darker than average
-                vertical_lines.append(i)
-        
-        # Group consecutive line positions to find line centers and thickness
-        def group_consecutive(lines):
-            if not lines:
-                return []
-            groups = []
-            current_group = [lines[0]]
-            
-            for line in lines[1:]:
-                if line - current_group[-1] <= 3:  # Lines within 3 pixels are same line
-                    current_group.append(line)
-                else:
-                    groups.append(current_group)
-                    current_group = [line]
-            groups.append(current_group)
-            
-            # Return center and thickness of each group
-            result = []
-            for group in groups:
-                center = sum(group) // len(group)
-                thickness = len(group)
-                result.append({'center': center, 'thickness': thickness})
-            return result
-        
-        h_groups = group_consecutive(horizontal_lines)
-        v_groups = group_consecutive(vertical_lines)
+        h_groups = self._group_line_positions(row_sums)
+        v_groups = self._group_line_positions(col_sums)
         
         return {
             'horizontal_lines': h_groups,
@@ -232,6 +317,23 @@ class OCRProcessor:
             )
         }
     
+    def _group_line_positions(self, dark_counts: np.ndarray) -> List[Dict[str, int]]:
+        """
+        Find the center and thickness of each line from per-row (or per-column) dark pixel counts
+        """
+        # Positions with much more dark pixels than average are line pixels
+        positions = np.flatnonzero(dark_counts > np.mean(dark_counts) * 2)
+        if positions.size == 0:
+            return []
+        
+        # Positions within 3 pixels of the previous one belong to the same line
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(positions) > 3) + 1))
+        thickness = np.diff(np.append(starts, positions.size))
+        centers = np.add.reduceat(positions, starts) // thickness
+        
+        return [{'center': int(center), 'thickness': int(size)}
+                for center, size in zip(centers, thickness)]
+    
     def extract_cells_geometric(self, grid: np.ndarray) -> List[List[np.ndarray]]:
         """
         Extract cells using geometric analysis of actual line positions
@@ -308,56 +410,25 @@ class OCRProcessor:
             
         return cells
     
-    def extract_cells(self, grid: np.ndarray) -> List[List[np.ndarray]]:
+    def extract_cells(self, grid: np.ndarray) -> np.ndarray:
         """
-        Extract individual cell images using center-based geometric positioning
+        Extract individual cell images using center-based geometric positioning.
+        Returns one contiguous (9, 9, 100, 100) array of preprocessed cells.
         """
         height, width = grid.shape
-        cell_height = height // 9
-        cell_width = width // 9
         
-        cells = []
-        for i in range(9):
-            row = []
-            for j in range(9):
-                # Calculate the center of each cell, accounting for grid line thickness
-                # Grid lines are approximately 1-2 pixels, so adjust slightly inward
-                center_y = i * cell_height + cell_height // 2
-                center_x = j * cell_width + cell_width // 2
-                
-                # For cells near borders, shift center away from grid lines
-                # Apply adjustments more broadly to avoid grid line interference
-                if j <= 1:  # First two columns - shift right to avoid left grid lines
-                    center_x += 6
-                elif j >= 7:  # Last two columns - shift left to avoid right grid lines  
-                    center_x -= 6
-                    
-                if i <= 1:  # First two rows - shift down to avoid top grid lines
-                    center_y += 6
-                elif i >= 7:  # Last two rows - shift up to avoid bottom grid lines
-                    center_y -= 6
-                
-                # Extract a centered region around the digit  
-                # Use 80% of cell size to capture full digit while avoiding grid lines
-                extract_height = int(cell_height * 0.8)
-                extract_width = int(cell_width * 0.8)
-                
-                # Calculate boundaries centered on the digit location
-                y1 = max(0, center_y - extract_height // 2)
-                y2 = min(height, center_y + extract_height // 2)
-                x1 = max(0, center_x - extract_width // 2)
-                x2 = min(width, center_x + extract_width // 2)
-                
+        cells = np.empty((9, 9, 100, 100), dtype=np.uint8)
+        for i, row_slices in enumerate(_cell_slice_table(height, width)):
+            for j, bounds in enumerate(row_slices):
                 # Ensure we have a valid cell region
-                if y2 <= y1 or x2 <= x1:
+                if bounds is None:
                     cell = np.ones((20, 20), dtype=np.uint8) * 255
                 else:
+                    y1, y2, x1, x2 = bounds
                     cell = grid[y1:y2, x1:x2]
                 
                 # Apply preprocessing
-                cell = self.preprocess_cell(cell)
-                row.append(cell)
-            cells.append(row)
+                cells[i, j] = self.preprocess_cell(cell)
         
         return cells
     
@@ -372,18 +443,17 @@ class OCRProcessor:
         if len(cell.shape) == 3:
             cell = cv2.cvtColor(cell, cv2.COLOR_BGR2GRAY)
         
-        # Resize to standard size for OCR
-        cell = cv2.resize(cell, (100, 100), interpolation=cv2.INTER_CUBIC)
-        
-        # Use Otsu's thresholding for better adaptive thresholding
-        _, cell = cv2.threshold(cell, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # Resize to standard size for OCR. Crops from a perspective-corrected
+        # grid are already 100x100, so only the no-grid fallback pays for this
+        if cell.shape != (100, 100):
+            cell = cv2.resize(cell, (100, 100), interpolation=cv2.INTER_CUBIC)
         
-        # Ensure digits are black on white background
-        black_pixels = np.sum(cell == 0)
-        white_pixels = np.sum(cell == 255)
+        # Ensure digits are black on white background: a mostly dark cell is
+        # inverted by the threshold itself instead of a separate bitwise_not
+        polarity = cv2.THRESH_BINARY_INV if cv2.mean(cell)[0] < 127 else cv2.THRESH_BINARY
         
-        if black_pixels > white_pixels:
-            cell = cv2.bitwise_not(cell)
+        # Use Otsu's thresholding for better adaptive thresholding
+        _, cell = cv2.threshold(cell, 0, 255, polarity + cv2.THRESH_OTSU)
         
         # Light morphological operations to clean up noise
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
@@ -413,29 +483,15 @@ class OCRProcessor:
         # ONLY clean 1-2 pixel borders if they appear to be solid dark lines
         # This is very conservative to avoid damaging digits
         
-        # Check and clean top border only if it's a solid dark line
-        if h > 8:
-            top_strip = cleaned[0:1, :]
-            if np.mean(top_strip) < 100 and np.std(top_strip) < 50:  # Solid dark line
-                cleaned[0:1, :] = 255
-        
-        # Check and clean bottom border only if it's a solid dark line  
-        if h > 8:
-            bottom_strip = cleaned[h-1:h, :]
-            if np.mean(bottom_strip) < 100 and np.std(bottom_strip) < 50:  # Solid dark line
-                cleaned[h-1:h, :] = 255
-        
-        # Check and clean left border only if it's a solid dark line
-        if w > 8:
-            left_strip = cleaned[:, 0:1]
-            if np.mean(left_strip) < 100 and np.std(left_strip) < 50:  # Solid dark line
-                cleaned[:, 0:1] = 255
-        
-        # Check and clean right border only if it's a solid dark line
-        if w > 8:
-            right_strip = cleaned[:, w-1:w]
-            if np.mean(right_strip) < 100 and np.std(right_strip) < 50:  # Solid dark line
-                cleaned[:, w-1:w] = 255
+        # Check the top and bottom borders in one pass, then the left and right
+        # ones, so the side strips see the cleaned corners as before
+        rows = cleaned[[0, h - 1], :]
+        dark_rows = (rows.mean(axis=1) < 100) & (rows.std(axis=1) < 50)  # Solid dark lines
+        cleaned[np.array([0, h - 1])[dark_rows], :] = 255
+        
+        cols = cleaned[:, [0, w - 1]]
+        dark_cols = (cols.mean(axis=0) < 100) & (cols.std(axis=0) < 50)  # Solid dark lines
+        cleaned[:, np.array([0, w - 1])[dark_cols]] = 255
         
         return cleaned
     
@@ -448,66 +504,106 @@ class OCRProcessor:
             return 0, 0.0
         
         try:
-            # Try multiple preprocessing approaches for EasyOCR
-            # Approach 1: Larger size (cell is already 100x100 after preprocessing)
-            cell_large = cv2.resize(cell, (120, 120), interpolation=cv2.INTER_CUBIC)
-            
-            # EasyOCR expects RGB image
-            if len(cell_large.shape) == 2:
-                cell_rgb = cv2.cvtColor(cell_large, cv2.COLOR_GRAY2RGB)
-            else:
-                cell_rgb = cell_large
-            
-            results = self.easyocr_reader.readtext(
-                cell_rgb,
-                allowlist='123456789',
-                width_ths=0.001,  # More sensitive to smaller text
-                height_ths=0.001,  # More sensitive to smaller text
-                paragraph=False,
-                detail=1,
-                low_text=0.2,  # Lower threshold for text detection
-                text_threshold=0.3,  # Lower confidence threshold for more detections
-                link_threshold=0.2,  # Lower threshold for text linking
-                canvas_size=1280,  # Larger canvas for better recognition
-                mag_ratio=2.0  # Higher magnification ratio
-            )
-            
-            if not results:
-                # Try fallback approach with less aggressive preprocessing
-                cell_fallback = cv2.resize(cell, (100, 100), interpolation=cv2.INTER_CUBIC)
-                # Apply lighter preprocessing
-                cell_fallback = cv2.GaussianBlur(cell_fallback, (1, 1), 0)
-                
-                if len(cell_fallback.shape) == 2:
-                    cell_rgb_fallback = cv2.cvtColor(cell_fallback, cv2.COLOR_GRAY2RGB)
-                else:
-                    cell_rgb_fallback = cell_fallback
-                
-                results = self.easyocr_reader.readtext(
-                    cell_rgb_fallback,
-                    allowlist='123456789',
-                    width_ths=0.1,
-                    height_ths=0.1,
-                    paragraph=False,
-                    detail=1
-                )
-                
-                if not results:
-                    return 0, 0.0
-            
-            # Get the result with highest confidence
-            best_result = max(results, key=lambda x: x[2])
-            text, confidence = best_result[1], best_result[2]
-            
-            # Validate digit
-            if text.isdigit() and 1 <= int(text) <= 9:
-                return int(text), float(confidence)
-            else:
-                return 0, 0.0
+            return self._recognize_easyocr([cell])[0]
                 
         except Exception as e:
             logger.warning(f"EasyOCR recognition failed: {e}")
             return 0, 0.0
+    
+    def recognize_digits_easyocr_batch(self, cells: List[np.ndarray]) -> List[Tuple[int, float]]:
+        """
+        Use EasyOCR to recognize digits in many cells, with one recognizer call per pass on GPU
+        """
+        if not cells:
+            return []
+        
+        try:
+            return self._recognize_easyocr(cells)
+                
+        except Exception as e:
+            logger.warning(f"Batched EasyOCR recognition failed: {e}")
+            return [(0, 0.0)] * len(cells)
+    
+    def _recognize_easyocr(self, cells: List[np.ndarray]) -> List[Tuple[int, float]]:
+        """
+        Read preprocessed cells with the EasyOCR recognizer, in two passes
+        """
+        # Approach 1: Larger size (cell is already 100x100 after preprocessing)
+        reads = self._read_tiles([
+            cv2.resize(cell, (120, 120), interpolation=cv2.INTER_CUBIC) for cell in cells
+        ])
+        
+        # Fallback: the cells read as nothing are tried again at their own size
+        missing = [k for k, (text, _) in enumerate(reads) if not text]
+        if missing:
+            for k, read in zip(missing, self._read_tiles([cells[k] for k in missing])):
+                reads[k] = read
+        
+        return [self._easyocr_digit(text, confidence) for text, confidence in reads]
+    
+    def _read_tiles(self, tiles: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """
+        Run the EasyOCR recognizer over equally sized grayscale tiles.
+        On GPU the tiles are laid side by side and read as one batch. On CPU
+        EasyOCR recognizes box by box anyway, so each tile is read on its own
+        rather than paying for the side-by-side copy.
+        """
+        if not GPU_AVAILABLE:
+            return [self._read_boxes(tile, 1)[0] for tile in tiles]
+        return self._read_boxes(np.hstack(tiles), len(tiles))
+    
+    def _read_boxes(self, image: np.ndarray, count: int) -> List[Tuple[str, float]]:
+        """
+        Recognize count equally wide boxes laid side by side across image.
+        Each box is passed to the recognizer directly, so text detection is skipped entirely.
+        """
+        height, width = image.shape[0], image.shape[1] // count
+        boxes = [[k * width, (k + 1) * width, 0, height] for k in range(count)]
+        
+        results = self.easyocr_reader.recognize(
+            image, horizontal_list=boxes, free_list=[], batch_size=count,
+            reformat=False, **EASYOCR_RECOGNIZE_ARGS
+        )
+        
+        # Map each result back to its box by the box's left edge
+        reads = [('', 0.0)] * count
+        for box, text, confidence in results:
+            reads[int(box[0][0]) // width] = (text, float(confidence))
+        return reads
+    
+    def recognize_digits_cnn(self, cells: List[np.ndarray]) -> List[Tuple[int, float]]:
+        """
+        Classify many cells with the ONNX digit model in a single run
+        """
+        if self.digit_session is None or not cells:
+            return [(0, 0.0)] * len(cells)
+        
+        # MNIST layout: 28x28, white digit on black, scaled to [0, 1]
+        batch = np.stack([
+            cv2.resize(255 - cell, (28, 28), interpolation=cv2.INTER_AREA) for cell in cells
+        ]).astype(np.float32)[:, None] / 255.0
+        
+        input_name = self.digit_session.get_inputs()[0].name
+        logits = self.digit_session.run(None, {input_name: batch})[0]
+        
+        # Softmax so the scores can be compared with the other engines' confidences
+        logits = logits - logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        
+        digits = probs.argmax(axis=1)
+        confidences = probs[np.arange(len(cells)), digits]
+        
+        # Class 0 is not a Sudoku digit, so treat it as no detection
+        return [(int(d), float(c)) if d > 0 else (0, 0.0) for d, c in zip(digits, confidences)]
+    
+    def _easyocr_digit(self, text: str, confidence: float) -> Tuple[int, float]:
+        """Accept an EasyOCR read only if it is a single digit 1-9"""
+        # Validate digit
+        if text.isdigit() and 1 <= int(text) <= 9:
+            return int(text), confidence
+        else:
+            return 0, 0.0
 
     def recognize_digit_template(self, cell: np.ndarray) -> Tuple[int, float]:
         """
@@ -520,21 +616,27 @@ class OCRProcessor:
             # Resize cell to match template size (cell is now 100x100 after preprocessing)
             cell_resized = cv2.resize(cell, (30, 40), interpolation=cv2.INTER_CUBIC)
             
-            # Invert if needed (templates are inverted)
-            if np.mean(cell_resized) > 127:
-                cell_resized = 255 - cell_resized
+            # Cell and templates are the same size, so matching against all
+            # nine is one normalized correlation each, i.e. a single matmul.
+            # The template rows are already zero-mean and unit-norm, so the
+            # cell needs no centering, only its norm about its mean (exact
+            # in integers from the pixel sum and sum of squares)
+            pixels = cell_resized.ravel().astype(np.int64)
+            total = int(pixels.sum())
+            centered_sq = int(pixels @ pixels) - total * total / pixels.size
+            if centered_sq <= 0:
+                return 0, 0.0  # Blank cell correlates with nothing
+            scores = self.template_stack @ pixels.astype(np.float32)
             
-            best_match = 0
-            best_confidence = 0.0
+            # Invert if needed (templates are inverted): 255 - cell only
+            # flips the sign of every correlation
+            if total > 127 * pixels.size:
+                scores = -scores
+            scores /= np.sqrt(centered_sq)
             
-            for digit, template in self.digit_templates.items():
-                # Template matching
-                result = cv2.matchTemplate(cell_resized, template, cv2.TM_CCOEFF_NORMED)
-                _, max_val, _, _ = cv2.minMaxLoc(result)
-                
-                if max_val > best_confidence:
-                    best_confidence = max_val
-                    best_match = digit
+            best_index = int(np.argmax(scores))
+            best_match = best_index + 1
+            best_confidence = float(scores[best_index])
             
             # Higher confidence threshold to reduce false positives
             if best_confidence > 0.5:
@@ -553,31 +655,54 @@ class OCRProcessor:
         if cell.size == 0:
             return True
         
-        # For binary images after preprocessing, count black pixels (digits)
-        # Since preprocess_cell ensures black digits on white background
-        black_pixels = np.sum(cell < 127)
-        total_pixels = cell.size
-        
-        # Calculate the percentage of black pixels
-        black_ratio = black_pixels / total_pixels
-        
-        # If less than 0.3% of pixels are black, consider empty (less aggressive)
-        return black_ratio < 0.003
+        # Same black-pixel ratio test as empty_cell_mask, on a stack of one cell
+        return bool(self._black_ratios(cell.reshape(1, -1))[0] < EMPTY_BLACK_RATIO)
+    
+    def empty_cell_mask(self, cells: np.ndarray, threshold: Optional[float] = None) -> np.ndarray:
+        """
+        Classify all 81 cells as empty or not in one vectorized pass.
+        Uses the same black-pixel ratio test as is_cell_empty.
+        """
+        if threshold is None:
+            threshold = EMPTY_BLACK_RATIO
+        return (self._black_ratios(cells.reshape(81, -1)) < threshold).reshape(9, 9)
+    
+    @staticmethod
+    def _black_ratios(stack: np.ndarray) -> np.ndarray:
+        """
+        Fraction of black (< 127) pixels in each row of a (cells, pixels) stack.
+        preprocess_cell leaves black digits on a white background, so these are the digit pixels.
+        """
+        return np.count_nonzero(stack < 127, axis=1) / stack.shape[1]
     
     def enhanced_digit_recovery(self, cell: np.ndarray) -> Tuple[int, float]:
         """Enhanced recovery disabled to prevent false positives"""
         return 0, 0.0
     
-    def ensemble_recognition(self, cell: np.ndarray) -> Tuple[int, float, List[str]]:
+    def ensemble_recognition(self, cell: np.ndarray,
+                             easyocr_result: Optional[Tuple[int, float]] = None,
+                             candidates: Optional[Dict[str, Tuple[int, float]]] = None) -> Tuple[int, float, List[str]]:
         """
-        Use ensemble of recognition methods to achieve higher accuracy
+        Use ensemble of recognition methods to achieve higher accuracy.
+        Expects a non-empty cell (see empty_cell_mask). easyocr_result, when
+        given, is this cell's result from a batched EasyOCR pass. Each method's
+        (digit, confidence) is recorded in candidates, when given, by method name.
         """
-        if self.is_cell_empty(cell):
-            return 0, 1.0, ["empty_detection"]
-        
         # Try recognition methods (disable PaddleOCR temporarily for speed)
-        easy_digit, easy_conf = self.recognize_digit_easyocr(cell)
-        template_digit, template_conf = self.recognize_digit_template(cell)
+        if easyocr_result is None:
+            easyocr_result = self.recognize_digit_easyocr(cell)
+        easy_digit, easy_conf = easyocr_result
+        
+        # A high-confidence EasyOCR read decides the cell on its own below,
+        # so template matching is only needed otherwise
+        if easy_digit > 0 and easy_conf > 0.6:
+            template_digit, template_conf = 0, 0.0
+        else:
+            template_digit, template_conf = self.recognize_digit_template(cell)
+            if candidates is not None:
+                candidates['template'] = (template_digit, template_conf)
+        if candidates is not None:
+            candidates['easyocr'] = easyocr_result
         
         # Collect results
         results = []
@@ -630,161 +755,181 @@ class OCRProcessor:
         
         return best_digit, ensemble_confidence, sources
 
-    def process_cells(self, cells: List[List[np.ndarray]]) -> List[List[CellDetection]]:
+    def process_cells(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[List[List[str]]]]:
         """
-        Process all cells using ensemble recognition with validation
+        Process all cells using ensemble recognition with validation.
+        cells is the (9, 9, 100, 100) array from extract_cells.
+        Returns parallel (digits, confidence, sources) grids: an int8 9x9
+        array, a float 9x9 array and nested lists of source names.
         """
-        results = []
-        
-        # First pass: Initial OCR recognition
-        for i, row in enumerate(cells):
-            result_row = []
-            for j, cell in enumerate(row):
-                digit, confidence, sources = self.ensemble_recognition(cell)
-                detection = CellDetection(digit, confidence, sources, (i, j))
-                result_row.append(detection)
-            results.append(result_row)
-        
-        # Second pass: Validate against Sudoku rules and reassess low-confidence conflicts
-        validated_results, validation_conflicts = self.validate_and_reassess(results, cells)
+        digits, confidence, sources, validation_conflicts = self._recognize_cells(cells)
         
         # Store validation conflicts for reporting
         self.validation_conflicts = validation_conflicts
         
-        return validated_results
+        return digits, confidence, sources
     
-    def validate_and_reassess(self, detections: List[List[CellDetection]], cells: List[List[np.ndarray]]) -> Tuple[List[List[CellDetection]], List[Dict]]:
+    def _recognize_cells(self, cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[List[List[str]]], List[Dict]]:
+        """
+        Recognize and validate all cells, returning the (digits, confidence, sources)
+        grids and the conflicts found.
+        Keeps no per-image state on the processor so concurrent calls don't interfere.
+        """
+        # Find the empty cells in one pass so only filled ones reach the recognizers
+        empty = self.empty_cell_mask(cells)
+        occupied = [(int(i), int(j)) for i, j in np.argwhere(~empty)]
+        
+        # Empty cells are final already; filled cells are overwritten below
+        digits = np.zeros((9, 9), dtype=np.int8)
+        confidence = np.ones((9, 9), dtype=np.float64)
+        sources = [[["empty_detection"] for _ in range(9)] for _ in range(9)]
+        
+        # The digit classifier, when configured, decides the cells it is sure about
+        if self.digit_session is not None:
+            batch = self.recognize_digits_cnn([cells[i, j] for i, j in occupied])
+            remaining = []
+            for (i, j), (digit, digit_confidence) in zip(occupied, batch):
+                if digit > 0 and digit_confidence >= self.digit_confidence_threshold:
+                    digits[i, j], confidence[i, j], sources[i][j] = digit, digit_confidence, ['cnn']
+                else:
+                    remaining.append((i, j))
+            occupied = remaining
+        
+        # Run EasyOCR once over the remaining non-empty cells rather than once per cell
+        batch = self.recognize_digits_easyocr_batch([cells[i, j] for i, j in occupied])
+        
+        # First pass: Initial OCR recognition on top of the batched EasyOCR reads
+        occupied_cells = [cells[i, j] for i, j in occupied]
+        
+        # Each method's result per cell, kept so reassessment can reuse them
+        candidates = {position: {} for position in occupied}
+        cell_candidates = [candidates[position] for position in occupied]
+        recognized = map(self.ensemble_recognition, occupied_cells, batch, cell_candidates)
+        
+        for (i, j), (digit, digit_confidence, digit_sources) in zip(occupied, recognized):
+            digits[i, j], confidence[i, j], sources[i][j] = digit, digit_confidence, digit_sources
+        
+        # Second pass: Validate against Sudoku rules and reassess low-confidence conflicts
+        validation_conflicts = self.validate_and_reassess(digits, confidence, sources, cells, candidates)
+        return digits, confidence, sources, validation_conflicts
+    
+    def validate_and_reassess(self, digits: np.ndarray, confidence: np.ndarray,
+                              sources: List[List[List[str]]], cells: np.ndarray,
+                              candidates: Optional[Dict[Tuple[int, int], Dict[str, Tuple[int, float]]]] = None) -> List[Dict]:
         """
-        Validate OCR results against Sudoku rules and reassess conflicting low-confidence digits
+        Validate OCR results against Sudoku rules and reassess conflicting low-confidence digits.
+        Reassessed cells are updated in place in the digits, confidence and sources grids;
+        the conflicts found before reassessment are returned for reporting.
+        candidates holds the per-method results from the first pass, by cell,
+        so reassessment only runs the methods a cell has no result for.
         """
-        # Convert detections to grid format for validation
-        current_grid = [[det.digit for det in row] for row in detections]
-        
         # Find all conflicts
-        conflicts = self.find_sudoku_conflicts(current_grid)
+        conflicts = self.find_sudoku_conflicts(digits)
         original_conflicts = [conflict.copy() for conflict in conflicts]  # Store for reporting
         
+        # Only reassess if confidence is below threshold (uncertain digits)
+        uncertain = [conflict for conflict in conflicts
+                     if confidence[conflict['row'], conflict['col']] < 0.8]  # Configurable threshold
+        
+        # Reuse the first pass's results. EasyOCR's reading of a cell doesn't
+        # depend on the grid, so cells without one are read in one batch
+        # before the sequential rule checks
+        known = [dict((candidates or {}).get((conflict['row'], conflict['col']), {}))
+                 for conflict in uncertain]
+        missing = [k for k, cell_candidates in enumerate(known) if 'easyocr' not in cell_candidates]
+        easyocr_results = self.recognize_digits_easyocr_batch(
+            [cells[uncertain[k]['row'], uncertain[k]['col']] for k in missing]
+        )
+        for k, easyocr_result in zip(missing, easyocr_results):
+            known[k]['easyocr'] = easyocr_result
+        
         # Process each conflict
-        for conflict in conflicts:
+        for conflict, cell_candidates in zip(uncertain, known):
             row, col, digit = conflict['row'], conflict['col'], conflict['value']
-            detection = detections[row][col]
             
-            # Only reassess if confidence is below threshold (uncertain digits)
-            if detection.confidence < 0.8:  # Configurable threshold
-                logger.info(f"Reassessing low-confidence digit {digit} at ({row}, {col}) due to Sudoku rule violation")
-                
-                # Try enhanced recovery methods
-                cell = cells[row][col]
-                new_digit, new_confidence, new_sources = self.reassess_conflicted_digit(
-                    cell, current_grid, row, col, detection
-                )
-                
-                if new_digit != digit:
-                    logger.info(f"Reassessment changed digit from {digit} to {new_digit} at ({row}, {col})")
-                    # Update the detection
-                    detections[row][col] = CellDetection(
-                        new_digit, new_confidence, new_sources, (row, col)
-                    )
-                    # Update current grid for subsequent validations
-                    current_grid[row][col] = new_digit
-        
-        return detections, original_conflicts
+            logger.info(f"Reassessing low-confidence digit {digit} at ({row}, {col}) due to Sudoku rule violation")
+            
+            # Try enhanced recovery methods
+            cell = cells[row, col]
+            detection = CellDetection(
+                digit, float(confidence[row, col]), sources[row][col], (row, col)
+            )
+            new_digit, new_confidence, new_sources = self.reassess_conflicted_digit(
+                cell, digits, row, col, detection, cell_candidates
+            )
+            
+            if new_digit != digit:
+                logger.info(f"Reassessment changed digit from {digit} to {new_digit} at ({row}, {col})")
+                # Update the cell; the digits grid is what later validations check
+                digits[row, col] = new_digit
+                confidence[row, col] = new_confidence
+                sources[row][col] = new_sources
+        
+        return original_conflicts
     
-    def find_sudoku_conflicts(self, grid: List[List[int]]) -> List[Dict]:
+    def find_sudoku_conflicts(self, grid: np.ndarray) -> List[Dict]:
         """
         Find all cells that violate Sudoku rules
         """
-        conflicts = []
+        grid = np.asarray(grid, dtype=np.int8)
+        
+        # Count each digit per row, column and box from a one-hot (9, 9, 9) view
+        one_hot = grid[..., None] == np.arange(1, 10)
+        row_counts = one_hot.sum(axis=1)
+        col_counts = one_hot.sum(axis=0)
+        box_counts = one_hot.reshape(3, 3, 3, 3, 9).sum(axis=(1, 3))
         
-        for row in range(9):
-            for col in range(9):
-                digit = grid[row][col]
-                if digit != 0 and not self.is_valid_placement(grid, row, col, digit):
-                    conflicts.append({
-                        'row': row,
-                        'col': col,
-                        'value': digit,
-                        'conflict_type': self.get_conflict_type(grid, row, col, digit)
-                    })
+        # A filled cell conflicts when its digit occurs more than once in a unit
+        rows, cols = np.indices((9, 9))
+        digit_index = grid.astype(np.intp) - 1
+        filled = grid > 0
+        row_conflict = filled & (row_counts[rows, digit_index] > 1)
+        col_conflict = filled & (col_counts[cols, digit_index] > 1)
+        box_conflict = filled & (box_counts[rows // 3, cols // 3, digit_index] > 1)
+        
+        conflicts = []
+        for row, col in np.argwhere(row_conflict | col_conflict | box_conflict).tolist():
+            if row_conflict[row, col]:
+                conflict_type = 'row'
+            elif col_conflict[row, col]:
+                conflict_type = 'column'
+            else:
+                conflict_type = 'box'
+            conflicts.append({
+                'row': row,
+                'col': col,
+                'value': int(grid[row, col]),
+                'conflict_type': conflict_type
+            })
         
         return conflicts
     
-    def is_valid_placement(self, grid: List[List[int]], row: int, col: int, digit: int) -> bool:
+    def is_valid_placement(self, grid: np.ndarray, row: int, col: int, digit: int) -> bool:
         """
         Check if placing digit at (row, col) violates Sudoku rules
         """
-        # Temporarily clear the cell for validation
-        original = grid[row][col]
-        grid[row][col] = 0
-        
-        # Check row
-        for j in range(9):
-            if grid[row][j] == digit:
-                grid[row][col] = original
-                return False
-        
-        # Check column
-        for i in range(9):
-            if grid[i][col] == digit:
-                grid[row][col] = original
-                return False
-        
-        # Check 3x3 box
-        box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if grid[i][j] == digit:
-                    grid[row][col] = original
-                    return False
-        
-        grid[row][col] = original
-        return True
+        return placement_conflict(np.asarray(grid, dtype=np.int8), row, col, digit) == CONFLICT_NONE
     
-    def get_conflict_type(self, grid: List[List[int]], row: int, col: int, digit: int) -> str:
+    def reassess_conflicted_digit(self, cell: np.ndarray, current_grid: np.ndarray, 
+                                row: int, col: int, original_detection: CellDetection,
+                                original_candidates: Optional[Dict[str, Tuple[int, float]]] = None) -> Tuple[int, float, List[str]]:
         """
-        Determine the type of Sudoku rule violation
+        Reassess a conflicted digit using standard OCR methods and rule-based filtering.
+        original_candidates maps method names to this cell's earlier (digit, confidence)
+        results; only the methods missing from it are run again.
         """
-        original = grid[row][col]
-        grid[row][col] = 0
-        
-        # Check row conflict
-        for j in range(9):
-            if grid[row][j] == digit:
-                grid[row][col] = original
-                return 'row'
-        
-        # Check column conflict
-        for i in range(9):
-            if grid[i][col] == digit:
-                grid[row][col] = original
-                return 'column'
-        
-        # Check box conflict
-        box_row, box_col = 3 * (row // 3), 3 * (col // 3)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if grid[i][j] == digit:
-                    grid[row][col] = original
-                    return 'box'
+        original_candidates = original_candidates or {}
         
-        grid[row][col] = original
-        return 'unknown'
-    
-    def reassess_conflicted_digit(self, cell: np.ndarray, current_grid: List[List[int]], 
-                                row: int, col: int, original_detection: CellDetection) -> Tuple[int, float, List[str]]:
-        """
-        Reassess a conflicted digit using standard OCR methods and rule-based filtering
-        """
         # Get all possible digits from different OCR methods
         candidates = []
         
         # EasyOCR
-        easy_digit, easy_conf = self.recognize_digit_easyocr(cell)
+        easy_digit, easy_conf = original_candidates.get('easyocr') or self.recognize_digit_easyocr(cell)
         if easy_digit != 0:
             candidates.append((easy_digit, easy_conf, 'easyocr'))
         
         # Template matching
-        template_digit, template_conf = self.recognize_digit_template(cell)
+        template_digit, template_conf = original_candidates.get('template') or self.recognize_digit_template(cell)
         if template_digit != 0:
             candidates.append((template_digit, template_conf, 'template'))
         
@@ -814,7 +959,11 @@ class OCRProcessor:
         if isinstance(image_path_or_array, str):
             image = cv2.imread(image_path_or_array)
         elif isinstance(image_path_or_array, Image.Image):
-            image = cv2.cvtColor(np.array(image_path_or_array), cv2.COLOR_RGB2BGR)
+            # Other modes (L, P, RGBA, ...) have no three RGB channels to swap
+            pil_image = image_path_or_array
+            if pil_image.mode != 'RGB':
+                pil_image = pil_image.convert('RGB')
+            image = cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2BGR)
         else:
             image = image_path_or_array
         
@@ -833,54 +982,29 @@ class OCRProcessor:
         cells = self.extract_cells(grid)
         
         # OCR processing
-        detections = self.process_cells(cells)
-        
-        # Build result grid and metadata
-        original_grid = []
-        confidence_scores = []
-        recognition_sources = []
-        given_positions = []
-        uncertain_cells = []
-        
-        total_confidence = 0
-        digit_count = 0
-        
-        for i, row in enumerate(detections):
-            grid_row = []
-            conf_row = []
-            sources_row = []
-            
-            for j, detection in enumerate(row):
-                grid_row.append(detection.digit)
-                conf_row.append(detection.confidence)
-                sources_row.append(detection.sources)
-                
-                if detection.digit > 0:
-                    given_positions.append((i, j))
-                    total_confidence += detection.confidence
-                    digit_count += 1
-                    
-                    # Flag uncertain cells (low confidence)
-                    if detection.confidence < 0.7:
-                        uncertain_cells.append((i, j))
-            
-            original_grid.append(grid_row)
-            confidence_scores.append(conf_row)
-            recognition_sources.append(sources_row)
+        digits, confidence, sources, validation_conflicts = self._recognize_cells(cells)
+        
+        # Build result grid and metadata with mask operations over the 9x9 grids
+        given = digits > 0
+        given_positions = [tuple(position) for position in np.argwhere(given).tolist()]
+        
+        # Flag uncertain cells (low confidence)
+        uncertain_cells = [tuple(position) for position in np.argwhere(given & (confidence < 0.7)).tolist()]
         
         # Calculate overall accuracy estimate
-        accuracy_estimate = total_confidence / digit_count if digit_count > 0 else 0.0
+        digit_count = len(given_positions)
+        accuracy_estimate = float(confidence[given].sum()) / digit_count if digit_count > 0 else 0.0
         
         processing_time = time.time() - start_time
         
         result = {
-            "original_grid": original_grid,
+            "original_grid": digits.tolist(),
             "solved_grid": None,  # Will be filled by solver
             "given_positions": given_positions,
-            "confidence_scores": confidence_scores,
-            "recognition_sources": recognition_sources,
+            "confidence_scores": confidence.tolist(),
+            "recognition_sources": sources,
             "uncertain_cells": uncertain_cells,
-            "validation_conflicts": getattr(self, 'validation_conflicts', []),
+            "validation_conflicts": validation_conflicts,
             "processing_time": processing_time,
             "valid_puzzle": len(given_positions) >= 17,  # Minimum clues for valid Sudoku
             "unique_solution": False,  # Will be determined by solver
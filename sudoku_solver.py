@@ -4,80 +4,184 @@ Sudoku solver implementation for the complete solution
 """
 
 import numpy as np
-from typing import List, Tuple, Optional
+import random
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+import functools
+import multiprocessing
+import queue
+import threading
+from typing import Iterator, List, Tuple, Optional, Dict, Set, Union
+from numba_kernels import (DIGIT_ORDER, NUMBA_AVAILABLE, SEARCH_EXHAUSTED, SEARCH_FAILED,
+                           SEARCH_SOLVED, solve_grid)
+
+def _build_peers() -> Dict[Tuple[int, int], Tuple[Tuple[int, int], ...]]:
+    """Map each cell to the 20 cells sharing its row, column or box"""
+    peers = {}
+    for r in range(9):
+        for c in range(9):
+            box_row, box_col = (r // 3) * 3, (c // 3) * 3
+            cells = {(r, j) for j in range(9)} | {(i, c) for i in range(9)}
+            cells |= {(i, j) for i in range(box_row, box_row + 3) for j in range(box_col, box_col + 3)}
+            cells.discard((r, c))
+            peers[(r, c)] = tuple(sorted(cells))
+    return peers
+
+PEERS = _build_peers()
+
+# Box index of each cell, looked up as BOX_OF[r][c] in the solvers' hot loops
+BOX_OF = tuple(tuple((r // 3) * 3 + c // 3 for c in range(9)) for r in range(9))
+
+# The 27 units (rows, columns, boxes) as tuples of cells
+UNITS = (tuple(tuple((r, c) for c in range(9)) for r in range(9)) +
+         tuple(tuple((r, c) for r in range(9)) for c in range(9)) +
+         tuple(tuple((r, c) for r in range(br, br + 3) for c in range(bc, bc + 3))
+               for br in range(0, 9, 3) for bc in range(0, 9, 3)))
+
+def _flatten(grid: List[List[int]]) -> array:
+    """Copy a 9x9 grid into a flat signed-byte buffer indexed by r * 9 + c"""
+    return array('b', [digit for row in grid for digit in row])
 
 class SudokuSolver:
     def __init__(self):
-        """Initialize the Sudoku solver."""
-        self.grid = None
-    
-    def is_valid(self, grid: List[List[int]], row: int, col: int, num: int) -> bool:
-        """Check if placing num at (row, col) is valid"""
-        
-        # Check row
-        for j in range(9):
-            if grid[row][j] == num:
-                return False
+        """Initialize the Sudoku solver.
         
-        # Check column
-        for i in range(9):
-            if grid[i][col] == num:
-                return False
-        
-        # Check 3x3 box
-        box_row = (row // 3) * 3
-        box_col = (col // 3) * 3
+        Digits in use are tracked as one bitmask per row, column and box:
+        bit d-1 is set when digit d is present in that unit.
+        """
+        self.cells = array('b', bytes(81))
+        self.row_mask = [0] * 9
+        self.col_mask = [0] * 9
+        self.box_mask = [0] * 9
+        self.empties = []
+    
+    def _load(self, grid: List[List[int]]) -> None:
+        """Build the unit bitmasks and the empty-cell list for grid in one pass.
         
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if grid[i][j] == num:
-                    return False
+        solve_with_steps() searches on self.cells, a flat copy of grid, so
+        grid itself is never written.
+        """
+        self.cells = _flatten(grid)
+        self.row_mask = row_mask = [0] * 9
+        self.col_mask = col_mask = [0] * 9
+        self.box_mask = box_mask = [0] * 9
+        self.empties = empties = []
         
-        return True
+        for r in range(9):
+            row = grid[r]
+            for c in range(9):
+                digit = row[c]
+                if digit == 0:
+                    empties.append((r, c))
+                    continue
+                bit = 1 << (digit - 1)
+                row_mask[r] |= bit
+                col_mask[c] |= bit
+                box_mask[BOX_OF[r][c]] |= bit
     
-    def solve(self, grid: List[List[int]]) -> bool:
-        """Solve the Sudoku puzzle using backtracking"""
+    def _used(self, row: int, col: int) -> int:
+        """Bitmask of the digits already used by the row, column and box of (row, col)"""
+        return self.row_mask[row] | self.col_mask[col] | self.box_mask[BOX_OF[row][col]]
+    
+    def _used_in(self, grid: List[List[int]], row: int, col: int) -> int:
+        """Bitmask of the digits grid has in the row, column and box of (row, col),
+        read from grid itself so edits made between calls are always seen"""
+        used = 0
+        for r, c in PEERS[(row, col)] + ((row, col),):
+            digit = grid[r][c]
+            if digit:
+                used |= 1 << (digit - 1)
+        return used
+    
+    def _place(self, row: int, col: int, bit: int) -> None:
+        """Toggle digit bit in the masks of (row, col): sets it on placement, clears it on backtrack"""
+        self.row_mask[row] ^= bit
+        self.col_mask[col] ^= bit
+        self.box_mask[BOX_OF[row][col]] ^= bit
+    
+    @contextmanager
+    def preserving(self, grid: List[List[int]],
+                   cells: Optional[List[Tuple[int, int]]] = None) -> Iterator[List[List[int]]]:
+        """Let grid be changed inside the block, restoring the given cells afterwards.
         
-        # Find empty cell
-        for i in range(9):
-            for j in range(9):
-                if grid[i][j] == 0:
-                    # Try numbers 1-9
-                    for num in range(1, 10):
-                        if self.is_valid(grid, i, j, num):
-                            grid[i][j] = num
-                            
-                            if self.solve(grid):
-                                return True
-                            
-                            # Backtrack
-                            grid[i][j] = 0
-                    
-                    return False
+        cells defaults to the grid's empty cells, which is all solve() writes,
+        so a solvability check needs no copy of the grid.
+        """
+        if cells is None:
+            cells = [(r, c) for r in range(9) for c in range(9) if grid[r][c] == 0]
+        saved = [(r, c, grid[r][c]) for r, c in cells]
+        try:
+            yield grid
+        finally:
+            for r, c, digit in saved:
+                grid[r][c] = digit
+    
+    def is_valid(self, grid: List[List[int]], row: int, col: int, num: int) -> bool:
+        """Check if placing num at (row, col) is valid"""
+        return not self._used_in(grid, row, col) & (1 << (num - 1))
+    
+    def _most_constrained(self) -> Optional[Tuple[int, int, int]]:
+        """Return (row, col, candidate mask) of the open cell with the fewest
+        candidates, or None once every cell is filled"""
+        cells = self.cells
+        best = None
+        best_count = 10
+        for r, c in self.empties:
+            if cells[r * 9 + c] != 0:
+                continue
+            candidates = ~self._used(r, c) & 0x1FF
+            count = bin(candidates).count('1')
+            if count < best_count:
+                best, best_count = (r, c, candidates), count
+                if count <= 1:  # Forced move or dead end, nothing scores lower
+                    break
+        return best
+    
+    def solve(self, grid: Union[List[List[int]], np.ndarray]) -> bool:
+        """Solve the Sudoku puzzle in place.
         
-        return True
+        Delegates to the module's search: the givens are checked, AC-3
+        prunes the candidates and fast_solve() backtracks from the most
+        constrained cell. Returns False if the givens conflict or the puzzle
+        has no solution, leaving grid as it was.
+        """
+        is_valid, *masks = validate_and_prepare(grid)
+        domains = ac3_reduce(grid, masks) if is_valid else None
+        return domains is not None and fast_solve(grid, domains, masks)
     
-    def validate_puzzle(self, grid: List[List[int]]) -> Tuple[bool, List[str]]:
-        """Validate if the puzzle has a valid setup (no conflicts)"""
+    def validate_puzzle(self, grid: List[List[int]]) -> Tuple[bool, List[dict]]:
+        """Validate if the puzzle has a valid setup (no conflicts).
         
-        errors = []
+        Returns (is_valid, conflicts), one {'position': (row, col), 'digit': num}
+        dict per filled cell whose digit repeats in its row, column or box.
+        """
         
-        # Check each filled cell for conflicts
+        # First pass: record every digit seen twice in a unit
+        row_mask, col_mask, box_mask = [0] * 9, [0] * 9, [0] * 9
+        row_dup, col_dup, box_dup = [0] * 9, [0] * 9, [0] * 9
         for i in range(9):
             for j in range(9):
                 if grid[i][j] != 0:
-                    num = grid[i][j]
-                    
-                    # Temporarily remove the number to check validity
-                    grid[i][j] = 0
-                    
-                    if not self.is_valid(grid, i, j, num):
-                        errors.append(f"Conflict at ({i},{j}) with digit {num}")
-                    
-                    # Restore the number
-                    grid[i][j] = num
+                    bit = 1 << (grid[i][j] - 1)
+                    b = BOX_OF[i][j]
+                    row_dup[i] |= row_mask[i] & bit
+                    col_dup[j] |= col_mask[j] & bit
+                    box_dup[b] |= box_mask[b] & bit
+                    row_mask[i] |= bit
+                    col_mask[j] |= bit
+                    box_mask[b] |= bit
         
-        return len(errors) == 0, errors
+        # Second pass: a filled cell conflicts when its digit is duplicated in one of its units
+        conflicts = []
+        for i in range(9):
+            for j in range(9):
+                num = grid[i][j]
+                if num != 0 and (row_dup[i] | col_dup[j] | box_dup[BOX_OF[i][j]]) & (1 << (num - 1)):
+                    conflicts.append({'position': (i, j), 'digit': num})
+        
+        return len(conflicts) == 0, conflicts
     
     def get_candidates(self, grid: List[List[int]], row: int, col: int) -> List[int]:
         """Get possible candidates for a cell"""
@@ -85,52 +189,591 @@ class SudokuSolver:
         if grid[row][col] != 0:
             return []
         
-        candidates = []
-        for num in range(1, 10):
-            if self.is_valid(grid, row, col, num):
-                candidates.append(num)
+        free = ~self._used_in(grid, row, col) & 0x1FF
+        return [num for num in range(1, 10) if free >> (num - 1) & 1]
+    
+    def solve_parallel(self, grid: Union[List[List[int]], np.ndarray], workers: int = 4,
+                       timeout: Optional[float] = 5.0, pool: Optional["SolverPool"] = None) -> bool:
+        """Solve like solve(), racing searches in separate processes on hard puzzles.
         
-        return candidates
+        fast_solve() first gets PARALLEL_ITERATION_BUDGET placements; only
+        if it runs out does the module's solve_parallel() race workers
+        randomized searches, on pool when given and otherwise on the
+        long-lived shared_pool().
+        """
+        is_valid, *masks = validate_and_prepare(grid)
+        domains = ac3_reduce(grid, masks) if is_valid else None
+        return domains is not None and solve_parallel(grid, domains, masks, workers=workers,
+                                                      timeout=timeout, pool=pool,
+                                                      budget=PARALLEL_ITERATION_BUDGET)
     
-    def solve_with_steps(self, grid: List[List[int]]) -> Tuple[bool, List[List[int]], int]:
-        """Solve and return intermediate steps"""
+    def solve_with_steps(self, grid: List[List[int]]) -> Tuple[bool, List[Tuple[str, int, int, int]], int]:
+        """Solve and return the search as steps.
         
-        # Make a copy to work with
-        working_grid = [row[:] for row in grid]
+        Each step is ("place", row, col, digit) or ("undo", row, col, digit);
+        replay_steps() turns them back into full grids. The search runs
+        on an explicit stack of (row, col, untried candidates) frames, most
+        constrained cell first.
+        """
+        
+        self._load(grid)
+        cells = self.cells
         steps = []
-        iterations = 0
+        iterations = 1
         
-        def solve_recursive(current_grid):
-            nonlocal iterations
-            iterations += 1
+        cell = self._most_constrained()
+        if cell is None:
+            return True, steps, iterations
+        stack = [cell]
+        
+        while stack:
+            r, c, candidates = stack[-1]
             
-            if iterations > 100000:  # Prevent infinite loops
-                return False
+            # Backtrack: undo the digit tried last in this cell
+            digit = cells[r * 9 + c]
+            if digit != 0:
+                cells[r * 9 + c] = 0
+                self._place(r, c, 1 << (digit - 1))
+                steps.append(("undo", r, c, digit))
             
-            # Save current state
-            steps.append([row[:] for row in current_grid])
+            if not candidates:
+                stack.pop()
+                continue
             
-            # Find empty cell
-            for i in range(9):
-                for j in range(9):
-                    if current_grid[i][j] == 0:
-                        # Try numbers 1-9
-                        for num in range(1, 10):
-                            if self.is_valid(current_grid, i, j, num):
-                                current_grid[i][j] = num
-                                
-                                if solve_recursive(current_grid):
-                                    return True
-                                
-                                # Backtrack
-                                current_grid[i][j] = 0
-                        
-                        return False
+            bit = candidates & -candidates
+            stack[-1] = (r, c, candidates ^ bit)
+            digit = bit.bit_length()
+            cells[r * 9 + c] = digit
+            self._place(r, c, bit)
+            steps.append(("place", r, c, digit))
             
-            return True
+            iterations += 1
+            if iterations > 100000:  # Prevent infinite loops
+                return False, steps, iterations
+            
+            cell = self._most_constrained()
+            if cell is None:
+                return True, steps, iterations
+            stack.append(cell)
         
-        success = solve_recursive(working_grid)
-        return success, steps, iterations
+        return False, steps, iterations
+    
+    def replay_steps(self, grid: List[List[int]],
+                     steps: List[Tuple[str, int, int, int]]) -> Iterator[List[List[int]]]:
+        """Replay solve_with_steps() deltas on a copy of grid, yielding the grid after each step.
+        
+        Only one grid is alive at a time unless the caller keeps them, so a
+        UI can step through a long search without holding its whole history.
+        """
+        current = [row[:] for row in grid]
+        for action, r, c, digit in steps:
+            current[r][c] = digit if action == "place" else 0
+            yield [row[:] for row in current]
+    
+    def reconstruct_steps(self, grid: List[List[int]], steps: List[Tuple[str, int, int, int]]) -> List[List[List[int]]]:
+        """List form of replay_steps(), for callers that want every grid at once"""
+        return list(self.replay_steps(grid, steps))
+
+Masks = Tuple[List[int], List[int], List[int], List[Tuple[int, int]]]
+
+def validate_and_prepare(grid: Union[List[List[int]], np.ndarray]) -> Tuple[bool, List[int], List[int], List[int], List[Tuple[int, int]]]:
+    """Check the givens for conflicts and build the solver's bitmasks in one pass.
+
+    Returns (is_valid, row_mask, col_mask, box_mask, empties). Bit d-1 of a
+    row/column/box mask is set when digit d is already used in that unit.
+    The masks and empty-cell list can be passed on to ac3_reduce() and
+    fast_solve() so neither has to walk the grid again.
+    """
+    if isinstance(grid, np.ndarray):
+        grid = grid.tolist()  # int8 digits would overflow when shifted into masks
+
+    row_mask = [0] * 9
+    col_mask = [0] * 9
+    box_mask = [0] * 9
+    empties = []
+
+    for r in range(9):
+        row = grid[r]
+        for c in range(9):
+            digit = row[c]
+            if digit == 0:
+                empties.append((r, c))
+                continue
+
+            bit = 1 << (digit - 1)
+            box = BOX_OF[r][c]
+            if (row_mask[r] | col_mask[c] | box_mask[box]) & bit:
+                return False, row_mask, col_mask, box_mask, empties
+
+            row_mask[r] |= bit
+            col_mask[c] |= bit
+            box_mask[box] |= bit
+
+    return True, row_mask, col_mask, box_mask, empties
+
+def ac3_reduce(grid: List[List[int]], masks: Optional[Masks] = None) -> Optional[Dict[Tuple[int, int], Set[int]]]:
+    """Reduce the domains of the empty cells to arc consistency (AC-3).
+
+    Initial domains come from the masks of validate_and_prepare() when
+    given, otherwise from scanning each cell's peers. Hidden singles are
+    fixed along the way. Returns a mapping from each empty cell to its
+    remaining candidate digits, or None if some cell is left without any
+    candidate.
+    """
+    domains = {}
+    if masks is not None:
+        row_mask, col_mask, box_mask, empties = masks
+        for r, c in empties:
+            free = ~(row_mask[r] | col_mask[c] | box_mask[BOX_OF[r][c]]) & 0x1FF
+            if not free:
+                return None
+            domains[(r, c)] = {d for d in range(1, 10) if free >> (d - 1) & 1}
+    else:
+        for r in range(9):
+            for c in range(9):
+                if grid[r][c] == 0:
+                    used = {grid[i][j] for i, j in PEERS[(r, c)]}
+                    domain = set(range(1, 10)) - used
+                    if not domain:
+                        return None
+                    domains[(r, c)] = domain
+
+    # For the all-different constraint, revising Xi against Xj can only
+    # remove a value when Xj is down to that single value, so this pass
+    # also propagates naked singles
+    arcs = deque((cell, peer) for cell in domains for peer in PEERS[cell] if peer in domains)
+    while arcs:
+        while arcs:
+            xi, xj = arcs.popleft()
+            dj = domains[xj]
+            if len(dj) != 1:
+                continue
+
+            di = domains[xi]
+            value = next(iter(dj))
+            if value in di:
+                di.discard(value)
+                if not di:
+                    return None
+                for xk in PEERS[xi]:
+                    if xk != xj and xk in domains:
+                        arcs.append((xk, xi))
+
+        # Hidden singles: a cell that is a unit's only home for a digit is
+        # narrowed to it, and its peers are revised against it again
+        fixed = _hidden_singles(domains)
+        if fixed is None:
+            return None
+        arcs.extend((peer, cell) for cell in fixed for peer in PEERS[cell] if peer in domains)
+
+    return domains
+
+def _hidden_singles(domains: Dict[Tuple[int, int], Set[int]]) -> Optional[List[Tuple[int, int]]]:
+    """Narrow each cell that is the only place left for a digit in one of its units.
+
+    Returns the cells narrowed to a single digit, or None if a unit has
+    fewer digits left than open cells or a cell is the only place for two.
+    Assumes the givens do not conflict, so every digit missing from a unit
+    has to go in one of its open cells.
+    """
+    fixed = []
+    for unit in UNITS:
+        places = {}
+        open_cells = 0
+        for cell in unit:
+            domain = domains.get(cell)
+            if domain is None:
+                continue
+            open_cells += 1
+            for digit in domain:
+                places.setdefault(digit, []).append(cell)
+
+        if len(places) < open_cells:
+            return None
+
+        for digit, cells in places.items():
+            if len(cells) != 1:
+                continue
+            cell = cells[0]
+            domain = domains[cell]
+            if digit not in domain:  # Already narrowed to another digit of this unit
+                return None
+            if len(domain) > 1:
+                domains[cell] = {digit}
+                fixed.append(cell)
+
+    return fixed
+
+def fast_solve(grid: Union[List[List[int]], np.ndarray],
+               domains: Optional[Dict[Tuple[int, int], Set[int]]] = None,
+               masks: Optional[Masks] = None,
+               budget: Optional[int] = None) -> Optional[bool]:
+    """Solve the puzzle in place using bitmask constraints and MRV cell ordering.
+
+    The candidates for a cell are the clear bits of its row, column and box
+    masks OR-ed together. Masks from validate_and_prepare() are reused when
+    given (the caller's copies are left untouched). Domains from
+    ac3_reduce() further restrict the candidates. If no solution is found
+    the grid is left as it was given. With a budget the search gives up
+    after that many digit placements and returns None instead of False.
+
+    When Numba is installed the search runs in the compiled kernel from
+    numba_kernels, which fills a 9x9 int8 ndarray directly; otherwise it
+    falls back to the recursive Python search.
+    """
+    state = _prepare_search(grid, domains, masks)
+    if state is None:
+        return False  # Givens already conflict
+
+    if NUMBA_AVAILABLE:
+        return _search_compiled(grid, *state, budget=budget)
+
+    limit = None if budget is None else _PlacementBudget(budget)
+    if isinstance(grid, np.ndarray):
+        # Item access on an ndarray is far slower than on nested lists
+        work = grid.tolist()
+        solved = _search_masks(work, *state, stop=limit)
+        if solved:
+            grid[:] = work
+    else:
+        solved = _search_masks(grid, *state, stop=limit)
+
+    if not solved and limit is not None and limit.exhausted:
+        return None
+    return solved
+
+def _search_compiled(grid: Union[List[List[int]], np.ndarray], row_mask: List[int],
+                     col_mask: List[int], box_mask: List[int],
+                     empties: List[Tuple[int, int]],
+                     allowed: Optional[Dict[Tuple[int, int], int]] = None,
+                     budget: Optional[int] = None,
+                     digit_bits: np.ndarray = DIGIT_ORDER) -> Optional[bool]:
+    """Run the search state from _prepare_search() through the Numba kernel"""
+    if (isinstance(grid, np.ndarray) and grid.dtype == np.int8
+            and grid.flags.c_contiguous):
+        work = grid  # The kernel clears its cells again on failure
+    else:
+        work = np.array(grid, dtype=np.int8)
+    cells = np.array([r * 9 + c for r, c in empties], dtype=np.int64)
+    allowed_mask = np.full(81, 0x1FF, dtype=np.int16)
+    if allowed is not None:
+        for (r, c), mask in allowed.items():
+            allowed_mask[r * 9 + c] = mask
+
+    outcome = solve_grid(work, np.array(row_mask, dtype=np.int16),
+                         np.array(col_mask, dtype=np.int16),
+                         np.array(box_mask, dtype=np.int16), cells, allowed_mask,
+                         -1 if budget is None else budget, digit_bits)
+    if outcome == SEARCH_EXHAUSTED:
+        return None
+    if outcome != SEARCH_SOLVED:
+        return False
+
+    if work is not grid:
+        for r, c in empties:
+            grid[r][c] = int(work[r, c])
+    return True
+
+class _PlacementBudget:
+    """Stop event for _search_masks() that fires once a number of placements is used up"""
+
+    def __init__(self, placements: int):
+        self.left = placements
+
+    @property
+    def exhausted(self) -> bool:
+        return self.left < 0
+
+    def is_set(self) -> bool:
+        self.left -= 1
+        return self.left < 0
+
+def _prepare_search(grid: List[List[int]],
+                    domains: Optional[Dict[Tuple[int, int], Set[int]]],
+                    masks: Optional[Masks]) -> Optional[tuple]:
+    """Build the (row_mask, col_mask, box_mask, empties, allowed) search state.
+
+    grid is only read. Domains become per-cell allowed masks, so a cell
+    AC-3 reduced to one value is filled by the search itself (first, having
+    a single candidate) and cleared again if the search fails.
+    Returns None if the givens conflict.
+    """
+    if masks is None:
+        is_valid, row_mask, col_mask, box_mask, empties = validate_and_prepare(grid)
+        if not is_valid:
+            return None
+    else:
+        row_mask, col_mask, box_mask, empties = (list(m) for m in masks)
+
+    allowed = None
+    if domains is not None:
+        allowed = {cell: sum(1 << (d - 1) for d in domains[cell]) for cell in empties}
+
+    return row_mask, col_mask, box_mask, empties, allowed
+
+def _search_masks(grid: List[List[int]], row_mask: List[int], col_mask: List[int],
+                  box_mask: List[int], empties: List[Tuple[int, int]],
+                  allowed: Optional[Dict[Tuple[int, int], int]] = None,
+                  rng: Optional[random.Random] = None, stop=None) -> bool:
+    """Backtracking search over the empty cells, most constrained cell first.
+
+    With an rng the candidate digits are tried in random order, and the
+    search gives up as soon as the optional stop event is set.
+    """
+
+    if not empties:
+        return True
+
+    if stop is not None and stop.is_set():
+        return False
+
+    # Pick the empty cell with the fewest candidates
+    best_index = 0
+    best_candidates = 0
+    best_count = 10
+    for index, (r, c) in enumerate(empties):
+        candidates = ~(row_mask[r] | col_mask[c] | box_mask[BOX_OF[r][c]]) & 0x1FF
+        if allowed is not None:
+            candidates &= allowed[(r, c)]
+        count = bin(candidates).count('1')
+        if count < best_count:
+            best_index, best_candidates, best_count = index, candidates, count
+            if count <= 1:
+                break
+
+    if best_count == 0:
+        return False
+
+    # Swap the chosen cell to the end so it can be popped and restored cheaply
+    empties[best_index], empties[-1] = empties[-1], empties[best_index]
+    r, c = empties.pop()
+    box = BOX_OF[r][c]
+
+    candidates = best_candidates
+    if rng is None:
+        bits = []
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            bits.append(bit)
+    else:
+        bits = [1 << i for i in range(9) if candidates >> i & 1]
+        rng.shuffle(bits)
+
+    for bit in bits:
+        grid[r][c] = bit.bit_length()
+        row_mask[r] |= bit
+        col_mask[c] |= bit
+        box_mask[box] |= bit
+
+        if _search_masks(grid, row_mask, col_mask, box_mask, empties, allowed, rng, stop):
+            return True
+
+        # Backtrack
+        row_mask[r] ^= bit
+        col_mask[c] ^= bit
+        box_mask[box] ^= bit
+
+    grid[r][c] = 0
+    empties.append((r, c))
+    empties[best_index], empties[-1] = empties[-1], empties[best_index]
+    return False
+
+# Placements fast_solve() gets before solve_parallel() starts racing; almost
+# every puzzle is settled well within it, so only searches that have shown
+# themselves to be slow pay for the worker processes
+PARALLEL_ITERATION_BUDGET = 20000
+
+# Shared stop flags of the SolverPool a worker process belongs to
+_stop_flags = None
+
+def _init_parallel_worker(stop_flags) -> None:
+    """Give each worker process the flags that cancel the searches of a solve"""
+    global _stop_flags
+    _stop_flags = stop_flags
+
+class _StopSlot:
+    """Event-like view of one solve's slot in the shared stop flags"""
+
+    def __init__(self, flags, slot: int):
+        self.flags = flags
+        self.slot = slot
+
+    def is_set(self) -> bool:
+        return bool(self.flags[self.slot])
+
+    def set(self) -> None:
+        self.flags[self.slot] = 1
+
+class SolverPool:
+    """Long-lived process pool that solve_parallel() races its searches on.
+
+    Workers are started with the spawn context, so the pool is safe to
+    create from a process that already runs threads or has large libraries
+    loaded. Each concurrent solve borrows one slot of a shared stop-flag
+    array, so one race finishing never cancels another on the same workers.
+    """
+
+    def __init__(self, workers: Optional[int] = None, slots: int = 32):
+        context = multiprocessing.get_context("spawn")
+        self.stop_flags = context.Array('b', slots, lock=False)
+        self.free_slots = queue.SimpleQueue()
+        for slot in range(slots):
+            self.free_slots.put(slot)
+        self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                            initializer=_init_parallel_worker,
+                                            initargs=(self.stop_flags,))
+
+    def release(self, slot: int, futures: list) -> None:
+        """Free slot for the next solve once every one of futures has finished.
+
+        Returns at once: searches that were already running finish their
+        current restart in the background before the slot is reused.
+        """
+        if not futures:
+            self.stop_flags[slot] = 0
+            self.free_slots.put(slot)
+            return
+
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def finished(_future) -> None:
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                self.stop_flags[slot] = 0
+                self.free_slots.put(slot)
+
+        for future in futures:
+            future.add_done_callback(finished)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+@functools.lru_cache(maxsize=1)
+def shared_pool() -> SolverPool:
+    """Return the process-wide SolverPool, created on first use and kept for later races.
+
+    Its workers are only spawned when a race first submits to it.
+    """
+    return SolverPool()
+
+def _parallel_attempt(grid: List[List[int]],
+                      domains: Optional[Dict[Tuple[int, int], Set[int]]],
+                      masks: Optional[Masks], seed: int,
+                      slot: int) -> Tuple[int, Optional[List[List[int]]]]:
+    """Run one raced search with its own cell and digit ordering from seed.
+
+    With Numba the search runs in the compiled kernel as a series of
+    restarts, each with a fresh ordering and twice the placements of the
+    one before; the stop flag is checked between them. Without Numba one
+    Python search checks it at every node. Returns (outcome, solved grid),
+    where outcome is SEARCH_SOLVED, SEARCH_FAILED if the puzzle has no
+    solution, or SEARCH_EXHAUSTED if the search was stopped.
+    """
+
+    state = _prepare_search(grid, domains, masks)
+    if state is None:
+        return SEARCH_FAILED, None
+
+    row_mask, col_mask, box_mask, empties, allowed = state
+    rng = random.Random(seed)
+    rng.shuffle(empties)  # Varies how MRV ties are broken
+    stop = _StopSlot(_stop_flags, slot)
+
+    if not NUMBA_AVAILABLE:
+        if _search_masks(grid, row_mask, col_mask, box_mask, empties, allowed, rng, stop):
+            stop.set()
+            return SEARCH_SOLVED, grid
+        return (SEARCH_EXHAUSTED if stop.is_set() else SEARCH_FAILED), None
+
+    work = np.array(grid, dtype=np.int8)
+    digits = list(DIGIT_ORDER)
+    budget = PARALLEL_ITERATION_BUDGET
+    while not stop.is_set():
+        rng.shuffle(empties)
+        rng.shuffle(digits)
+        solved = _search_compiled(work, row_mask, col_mask, box_mask, empties, allowed,
+                                  budget=budget, digit_bits=np.array(digits, dtype=np.int16))
+        if solved:
+            stop.set()
+            return SEARCH_SOLVED, work.tolist()
+        if solved is not None:
+            return SEARCH_FAILED, None
+        budget *= 2
+    return SEARCH_EXHAUSTED, None
+
+def solve_parallel(grid: Union[List[List[int]], np.ndarray],
+                   domains: Optional[Dict[Tuple[int, int], Set[int]]] = None,
+                   masks: Optional[Masks] = None, workers: int = 4,
+                   timeout: Optional[float] = None,
+                   pool: Optional[SolverPool] = None,
+                   budget: Optional[int] = None) -> bool:
+    """Solve in place by racing randomized searches in separate processes.
+
+    Backtracking run time on hard puzzles varies a lot with the search
+    order, so the first of several differently-ordered searches to finish
+    is usually much faster than any single one. The others are stopped as
+    soon as a solution is found, or when the optional timeout in seconds
+    runs out; a race that times out is finished by an unbudgeted
+    fast_solve(), so a solvable puzzle is never reported unsolved. Takes
+    the same arguments as fast_solve(), plus the number of searches and the
+    SolverPool to run them on, shared_pool() by default. With a budget, fast_solve() is given that many
+    placements first and the race only starts if it runs out, so easy
+    puzzles never pay for the processes. With fewer than two workers there
+    is nothing to race and fast_solve() simply runs to the end.
+    """
+    if budget is not None:
+        solved = fast_solve(grid, domains, masks, budget)
+        if solved is not None:
+            return solved
+
+    if workers < 2:
+        return bool(fast_solve(grid, domains, masks))
+
+    work = grid.tolist() if isinstance(grid, np.ndarray) else [row[:] for row in grid]
+
+    if pool is None:
+        pool = shared_pool()
+    slot = pool.free_slots.get()
+    stop = _StopSlot(pool.stop_flags, slot)
+
+    outcome, solution = SEARCH_EXHAUSTED, None
+    futures = []
+    try:
+        futures = [pool.executor.submit(_parallel_attempt, work, domains, masks, seed, slot)
+                   for seed in range(workers)]
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                outcome, solution = future.result()
+                if outcome != SEARCH_EXHAUSTED:
+                    break
+        except TimeoutError:
+            pass
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        pool.release(slot, futures)
+
+    if outcome == SEARCH_FAILED:
+        return False
+    if solution is None:
+        return bool(fast_solve(grid, domains, masks))
+
+    if isinstance(grid, np.ndarray):
+        grid[:] = solution
+    else:
+        for row, solved_row in zip(grid, solution):
+            row[:] = solved_row
+    return True
+
+def conflict_message(conflict: dict) -> str:
+    """Format a validate_puzzle() conflict as a human-readable error"""
+    row, col = conflict['position']
+    return f"Conflict at ({row},{col}) with digit {conflict['digit']}"
 
 def create_sudoku_validator():
     """Create validation utilities for OCR results"""
@@ -139,8 +782,13 @@ def create_sudoku_validator():
         def __init__(self):
             self.solver = SudokuSolver()
         
-        def validate_ocr_result(self, detected_grid: List[List[int]]) -> dict:
-            """Validate OCR detected grid and suggest corrections"""
+        def validate_ocr_result(self, detected_grid: List[List[int]],
+                                solvable: Optional[bool] = None) -> dict:
+            """Validate OCR detected grid and suggest corrections.
+            
+            A caller that has already tried to solve the grid passes the
+            outcome as solvable, so the solvability search is not repeated.
+            """
             
             result = {
                 'is_valid': False,
@@ -151,16 +799,20 @@ def create_sudoku_validator():
             }
             
             # Check basic validity
-            is_valid, errors = self.solver.validate_puzzle(detected_grid)
+            is_valid, conflicts = self.solver.validate_puzzle(detected_grid)
             result['is_valid'] = is_valid
-            result['errors'] = errors
+            result['errors'] = [conflict_message(conflict) for conflict in conflicts]
             
             if not is_valid:
-                result['suggestions'] = self.suggest_corrections(detected_grid, errors)
+                result['suggestions'] = self.suggest_corrections(detected_grid, conflicts)
             
-            # Check if solvable
-            test_grid = [row[:] for row in detected_grid]
-            result['solvable'] = self.solver.solve(test_grid)
+            # Check if solvable; conflicting givens can never be completed,
+            # so only a valid grid is worth searching
+            if is_valid:
+                if solvable is None:
+                    with self.solver.preserving(detected_grid):
+                        solvable = self.solver.solve(detected_grid)
+                result['solvable'] = solvable
             
             # Calculate confidence based on filled cells and validity
             filled_cells = sum(1 for row in detected_grid for cell in row if cell != 0)
@@ -171,32 +823,25 @@ def create_sudoku_validator():
             
             return result
         
-        def suggest_corrections(self, grid: List[List[int]], errors: List[str]) -> List[dict]:
+        def suggest_corrections(self, grid: List[List[int]], conflicts: List[dict]) -> List[dict]:
             """Suggest corrections for invalid configurations"""
             
             suggestions = []
             
-            for error in errors:
-                # Parse error message to extract position and digit
-                if "Conflict at" in error:
-                    # Extract position and digit from error message
-                    import re
-                    match = re.search(r'\((\d+),(\d+)\).*digit (\d+)', error)
-                    if match:
-                        row, col, digit = int(match.group(1)), int(match.group(2)), int(match.group(3))
-                        
-                        # Get valid candidates for this position
-                        test_grid = [r[:] for r in grid]
-                        test_grid[row][col] = 0  # Remove conflicting digit
-                        
-                        candidates = self.solver.get_candidates(test_grid, row, col)
-                        
-                        suggestions.append({
-                            'position': (row, col),
-                            'current_digit': digit,
-                            'suggested_digits': candidates,
-                            'error': error
-                        })
+            for conflict in conflicts:
+                row, col = conflict['position']
+                
+                # Get valid candidates for this position
+                with self.solver.preserving(grid, [(row, col)]):
+                    grid[row][col] = 0  # Remove conflicting digit
+                    candidates = self.solver.get_candidates(grid, row, col)
+                
+                suggestions.append({
+                    'position': (row, col),
+                    'current_digit': conflict['digit'],
+                    'suggested_digits': candidates,
+                    'error': conflict_message(conflict)
+                })
             
             return suggestions
         
@@ -3,9 +3,16 @@
 Test the FastAPI server with the sample image
 """
 
+import numpy as np
 import requests
 import json
 import time
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session for every request, so the tests reuse a pooled
+# connection instead of opening a new socket per call
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 def test_server():
     """Test the server with sample-puzzle.png"""
@@ -18,7 +25,7 @@ def test_server():
     # Test 1: Health check
     print("📡 Testing health endpoint...")
     try:
-        response = requests.get(f"{server_url}/health")
+        response = session.get(f"{server_url}/health")
         if response.status_code == 200:
             print("✅ Health check passed")
         else:
@@ -31,7 +38,7 @@ def test_server():
     # Test 2: Root endpoint
     print("📡 Testing root endpoint...")
     try:
-        response = requests.get(server_url)
+        response = session.get(server_url)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Root endpoint: {data['message']}")
@@ -52,68 +59,70 @@ def test_server():
             print("⏱️  Sending image to server...")
             start_time = time.time()
             
-            response = requests.post(f"{server_url}/solve", files=files)
-            
-            processing_time = time.time() - start_time
-            
-            if response.status_code == 200:
-                print(f"✅ Request successful!")
-                print(f"⏱️  Total API Response Time: {processing_time:.2f}s")
-                
-                # Parse response
-                result = response.json()
-                
-                print(f"\n📊 API RESPONSE ANALYSIS:")
-                print(f"OCR Processing Time: {result['processing_time']:.2f}s")
-                print(f"Valid Puzzle: {result['valid_puzzle']}")
-                print(f"Unique Solution: {result['unique_solution']}")
-                print(f"Accuracy Estimate: {result['accuracy_estimate']:.1%}")
-                print(f"Given Positions: {len(result['given_positions'])}")
-                print(f"Uncertain Cells: {len(result['uncertain_cells'])}")
+            # Stream the response and close it on exit, returning the
+            # connection to the session's pool
+            with session.post(f"{server_url}/solve", files=files, stream=True,
+                              timeout=60) as response:
+                processing_time = time.time() - start_time
                 
-                # Display detected grid
-                print(f"\n🔢 DETECTED GRID:")
-                original_grid = result['original_grid']
-                for i, row in enumerate(original_grid):
-                    print(f"Row {i}: {' '.join(str(x) if x != 0 else '.' for x in row)}")
-                
-                # Display solution if available
-                if result['solved_grid']:
-                    print(f"\n🎉 COMPLETE SOLUTION:")
-                    solved_grid = result['solved_grid']
-                    for i, row in enumerate(solved_grid):
-                        print(f"Row {i}: {' '.join(str(x) for x in row)}")
+                if response.status_code == 200:
+                    print(f"✅ Request successful!")
+                    print(f"⏱️  Total API Response Time: {processing_time:.2f}s")
+                    
+                    # Parse response
+                    result = response.json()
+                    
+                    print(f"\n📊 API RESPONSE ANALYSIS:")
+                    print(f"OCR Processing Time: {result['processing_time']:.2f}s")
+                    print(f"Valid Puzzle: {result['valid_puzzle']}")
+                    print(f"Unique Solution: {result['unique_solution']}")
+                    print(f"Accuracy Estimate: {result['accuracy_estimate']:.1%}")
+                    print(f"Given Positions: {len(result['given_positions'])}")
+                    print(f"Uncertain Cells: {len(result['uncertain_cells'])}")
+                    
+                    # Display detected grid
+                    print(f"\n🔢 DETECTED GRID:")
+                    original_grid = result['original_grid']
+                    for i, row in enumerate(original_grid):
+                        print(f"Row {i}: {' '.join(str(x) if x != 0 else '.' for x in row)}")
+                    
+                    # Display solution if available
+                    if result['solved_grid']:
+                        print(f"\n🎉 COMPLETE SOLUTION:")
+                        solved_grid = result['solved_grid']
+                        for i, row in enumerate(solved_grid):
+                            print(f"Row {i}: {' '.join(str(x) for x in row)}")
+                        
+                        # Verify solution correctness
+                        is_valid_solution = verify_solution(solved_grid)
+                        print(f"\n🔍 Solution Verification: {'✅ Valid' if is_valid_solution else '❌ Invalid'}")
+                    else:
+                        print(f"\n❌ No solution provided")
+                    
+                    # Show enhanced recovery details
+                    enhanced_recoveries = []
+                    for i in range(9):
+                        for j in range(9):
+                            if 'enhanced_recovery' in result['recognition_sources'][i][j]:
+                                enhanced_recoveries.append((i, j, original_grid[i][j]))
+                    
+                    if enhanced_recoveries:
+                        print(f"\n🎯 ENHANCED RECOVERY SUCCESS:")
+                        for row, col, digit in enhanced_recoveries:
+                            print(f"  - Cell ({row},{col}): Recovered digit {digit}")
+                    
+                    # Performance summary
+                    print(f"\n📊 PERFORMANCE SUMMARY:")
+                    print(f"🎯 OCR Accuracy: 100% (on actual content)")
+                    print(f"⏱️  API Response: {processing_time:.2f}s")
+                    print(f"🔢 Digits Detected: {len(result['given_positions'])}")
+                    print(f"🧩 Puzzle Solved: {'✅ YES' if result['solved_grid'] else '❌ NO'}")
+                    print(f"🚀 System Status: {'🏆 PRODUCTION READY' if result['solved_grid'] else '🔧 NEEDS WORK'}")
                     
-                    # Verify solution correctness
-                    is_valid_solution = verify_solution(solved_grid)
-                    print(f"\n🔍 Solution Verification: {'✅ Valid' if is_valid_solution else '❌ Invalid'}")
                 else:
-                    print(f"\n❌ No solution provided")
-                
-                # Show enhanced recovery details
-                enhanced_recoveries = []
-                for i in range(9):
-                    for j in range(9):
-                        if 'enhanced_recovery' in result['recognition_sources'][i][j]:
-                            enhanced_recoveries.append((i, j, original_grid[i][j]))
-                
-                if enhanced_recoveries:
-                    print(f"\n🎯 ENHANCED RECOVERY SUCCESS:")
-                    for row, col, digit in enhanced_recoveries:
-                        print(f"  - Cell ({row},{col}): Recovered digit {digit}")
-                
-                # Performance summary
-                print(f"\n📊 PERFORMANCE SUMMARY:")
-                print(f"🎯 OCR Accuracy: 100% (on actual content)")
-                print(f"⏱️  API Response: {processing_time:.2f}s")
-                print(f"🔢 Digits Detected: {len(result['given_positions'])}")
-                print(f"🧩 Puzzle Solved: {'✅ YES' if result['solved_grid'] else '❌ NO'}")
-                print(f"🚀 System Status: {'🏆 PRODUCTION READY' if result['solved_grid'] else '🔧 NEEDS WORK'}")
-                
-            else:
-                print(f"❌ Request failed with status {response.status_code}")
-                print(f"Error: {response.text}")
-                
+                    print(f"❌ Request failed with status {response.status_code}")
+                    print(f"Error: {response.text}")
+                    
     except FileNotFoundError:
         print(f"❌ Image file not found: {image_path}")
     except Exception as e:
@@ -122,30 +131,16 @@ def test_server():
 def verify_solution(grid):
     """Verify that a completed grid is a valid Sudoku solution"""
     
-    # Check rows
-    for row in grid:
-        if sorted(row) != list(range(1, 10)):
-            return False
-    
-    # Check columns
-    for col in range(9):
-        column = [grid[row][col] for row in range(9)]
-        if sorted(column) != list(range(1, 10)):
-            return False
+    a = np.asarray(grid)
+    if a.shape != (9, 9):
+        return False
     
-    # Check 3x3 boxes
-    for box_row in range(3):
-        for box_col in range(3):
-            box = []
-            for i in range(3):
-                for j in range(3):
-                    row = box_row * 3 + i
-                    col = box_col * 3 + j
-                    box.append(grid[row][col])
-            if sorted(box) != list(range(1, 10)):
-                return False
+    # All 27 units as rows: the 9 rows, the 9 columns and the 9 boxes
+    boxes = a.reshape(3, 3, 3, 3).swapaxes(1, 2).reshape(9, 9)
+    units = np.concatenate((a, a.T, boxes))
     
-    return True
+    # Each unit must hold exactly the digits 1-9
+    return bool((np.sort(units, axis=1) == np.arange(1, 10)).all())
 
 if __name__ == "__main__":
     test_server()
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test the Sudoku solver without the server
+"""
+
+import numpy as np
+from sudoku_solver import (PARALLEL_ITERATION_BUDGET, SolverPool, SudokuSolver, ac3_reduce, fast_solve,
+                           shared_pool, solve_parallel, validate_and_prepare)
+
+PUZZLE = [
+    [3, 0, 5, 0, 0, 0, 1, 0, 8],
+    [0, 9, 0, 0, 5, 1, 7, 2, 0],
+    [0, 7, 0, 2, 3, 0, 6, 4, 5],
+    [0, 0, 7, 0, 4, 2, 0, 8, 1],
+    [0, 8, 0, 0, 0, 0, 9, 0, 0],
+    [1, 0, 9, 0, 0, 0, 0, 7, 0],
+    [0, 3, 2, 4, 0, 8, 5, 1, 7],
+    [0, 1, 0, 0, 0, 5, 4, 0, 0],
+    [6, 0, 0, 0, 9, 0, 8, 0, 0]
+]
+
+# Needs well over PARALLEL_ITERATION_BUDGET placements in the default search order
+HARD_PUZZLE = ".....6....59.....82....8....45........3........6..3.54...325..6.................."
+
+def parse_puzzle(text):
+    """Turn an 81-character puzzle string, '.' for empty cells, into a grid"""
+    return [[0 if ch == '.' else int(ch) for ch in text[r * 9:r * 9 + 9]] for r in range(9)]
+
+def verify_solution(grid):
+    """Verify that a completed grid is a valid Sudoku solution"""
+    
+    a = np.asarray(grid)
+    boxes = a.reshape(3, 3, 3, 3).swapaxes(1, 2).reshape(9, 9)
+    units = np.concatenate((a, a.T, boxes))
+    return bool((np.sort(units, axis=1) == np.arange(1, 10)).all())
+
+def test_solve_int8_ndarray():
+    """solve() fills an int8 ndarray in place, as the server passes it"""
+    
+    givens = np.array(PUZZLE, dtype=np.int8)
+    grid = givens.copy()
+    assert SudokuSolver().solve(grid)
+    assert grid.dtype == np.int8
+    assert verify_solution(grid)
+    assert (grid[givens != 0] == givens[givens != 0]).all()
+
+def test_solve_parallel_races_once_budget_is_exhausted():
+    """A zero budget sends the puzzle straight to the race on a reused pool"""
+    
+    is_valid, *masks = validate_and_prepare(PUZZLE)
+    domains = ac3_reduce(PUZZLE, masks)
+    pool = SolverPool(workers=2)
+    try:
+        for _ in range(2):
+            grid = np.array(PUZZLE, dtype=np.int8)
+            assert solve_parallel(grid, domains, masks, workers=2, timeout=30.0,
+                                  pool=pool, budget=0)
+            assert verify_solution(grid)
+    finally:
+        pool.shutdown()
+
+def test_solve_parallel_solves_hard_puzzle_over_budget():
+    """An over-budget puzzle is solved by the race, and by the fallback search
+    when the race is given no time at all"""
+    
+    puzzle = parse_puzzle(HARD_PUZZLE)
+    is_valid, *masks = validate_and_prepare(puzzle)
+    domains = ac3_reduce(puzzle, masks)
+    assert fast_solve(np.array(puzzle, dtype=np.int8), domains, masks,
+                      PARALLEL_ITERATION_BUDGET) is None
+    
+    pool = SolverPool(workers=2)
+    try:
+        for timeout in (30.0, 0.0):
+            grid = np.array(puzzle, dtype=np.int8)
+            assert solve_parallel(grid, domains, masks, workers=2, timeout=timeout,
+                                  pool=pool, budget=PARALLEL_ITERATION_BUDGET)
+            assert verify_solution(grid)
+    finally:
+        pool.shutdown()
+
+def test_solver_solve_parallel_reuses_shared_pool():
+    """Without a pool, SudokuSolver.solve_parallel races on one long-lived pool"""
+    
+    pool = shared_pool()
+    for _ in range(2):
+        grid = parse_puzzle(HARD_PUZZLE)
+        assert SudokuSolver().solve_parallel(grid, workers=2, timeout=30.0)
+        assert verify_solution(grid)
+    assert shared_pool() is pool
+
+if __name__ == "__main__":
+    test_solve_int8_ndarray()
+    test_solve_parallel_races_once_budget_is_exhausted()
+    test_solve_parallel_solves_hard_puzzle_over_budget()
+    test_solver_solve_parallel_reuses_shared_pool()
+    print("✅ Solver tests passed")
@@ -5,6 +5,12 @@ Test the web user interface
 
 import requests
 import time
+from requests.adapters import HTTPAdapter
+
+# One keep-alive session for every request, so the tests reuse a pooled
+# connection instead of opening a new socket per call
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 def test_web_interface():
     """Test the web interface is accessible"""
@@ -17,7 +23,7 @@ def test_web_interface():
     # Test 1: Check if main page loads
     print("📄 Testing main page...")
     try:
-        response = requests.get(server_url)
+        response = session.get(server_url)
         if response.status_code == 200 and "AI Sudoku Solver" in response.text:
             print("✅ Main page loads successfully")
             print(f"   Page size: {len(response.content)} bytes")
@@ -34,7 +40,7 @@ def test_web_interface():
     for static_file in static_files:
         print(f"📁 Testing {static_file}...")
         try:
-            response = requests.get(f"{server_url}/{static_file}")
+            response = session.get(f"{server_url}/{static_file}")
             if response.status_code == 200:
                 print(f"✅ {static_file} loads successfully")
                 print(f"   File size: {len(response.content)} bytes")
@@ -46,7 +52,7 @@ def test_web_interface():
     # Test 3: Check API endpoint still works
     print("🔌 Testing API endpoint...")
     try:
-        response = requests.get(f"{server_url}/api")
+        response = session.get(f"{server_url}/api")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ API endpoint works: {data['message']}")
@@ -60,7 +66,7 @@ def test_web_interface():
     try:
         with open("sample-puzzle.png", 'rb') as f:
             files = {'file': ('sample-puzzle.png', f, 'image/png')}
-            response = requests.post(f"{server_url}/solve", files=files, timeout=30)
+            response = session.post(f"{server_url}/solve", files=files, timeout=30)
             
             if response.status_code == 200:
                 result = response.json()